@@ -5,111 +5,449 @@ Identifies and categorizes Text the Spire mod windows.
 """
 
 import win32gui
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple
+import re
 import sys
+import time
 
 
-def enum_windows_callback(hwnd: int, windows: List[Dict]) -> bool:
-    """Callback function for EnumWindows to collect window information."""
-    if win32gui.IsWindowVisible(hwnd):
-        window_text = win32gui.GetWindowText(hwnd)
-        class_name = win32gui.GetClassName(hwnd)
+class Window(NamedTuple):
+    """A visible top-level window."""
+    hwnd: int
+    title: str
+    class_name: str
+    width: int
+    height: int
+    x: int
+    y: int
+    process_id: int
+
+
+class WindowTable(NamedTuple):
+    """Column-oriented view of a window list, one tuple per Window field."""
+    hwnds: Tuple[int, ...]
+    titles: Tuple[str, ...]
+    classes: Tuple[str, ...]
+    widths: Tuple[int, ...]
+    heights: Tuple[int, ...]
+    xs: Tuple[int, ...]
+    ys: Tuple[int, ...]
+    process_ids: Tuple[int, ...]
+
+
+def window_table(windows: List[Window]) -> WindowTable:
+    """Transpose window records into parallel columns for bulk filtering."""
+    if not windows:
+        return WindowTable(*(() for _ in Window._fields))
+    return WindowTable(*zip(*windows))
+
+
+# Cached (timestamp, windows) result of the last EnumWindows pass
+_SNAPSHOT_CACHE: Optional[Tuple[float, List[Window]]] = None
+
+
+# Window classes used by Slay the Spire and the Text the Spire mod
+_INTERESTING_CLASSES = frozenset(map(sys.intern, ('LWJGL', 'SunAwtFrame', 'SWT_Window0')))
+
+# Lowercase title fragments that mark other spire-related windows (e.g. ModTheSpire)
+_SPIRE_SUBSTRINGS = ('spire', 'text')
+
+# Single case-insensitive scanner for all of the substrings above
+_SPIRE_SUBSTRING_RE = re.compile('|'.join(map(re.escape, _SPIRE_SUBSTRINGS)), re.IGNORECASE)
+
+
+# Window class of each known Text the Spire title, passed to FindWindow
+KNOWN_CLASSES = {
+    'Slay the Spire': 'LWJGL',
+    'Prompt': 'SunAwtFrame',
+    'info': 'SunAwtFrame',
+    'Player': 'SWT_Window0',
+    'Monster': 'SWT_Window0',
+    'Hand': 'SWT_Window0',
+    'Deck': 'SWT_Window0',
+    'Discard': 'SWT_Window0',
+    'Orbs': 'SWT_Window0',
+    'Relic': 'SWT_Window0',
+    'Output': 'SWT_Window0',
+    'Log': 'SWT_Window0',
+}
+
+# Interned copies of the known class names and titles. Only these are
+# canonicalized, so arbitrary window titles never grow the intern table.
+_CANONICAL = {s: sys.intern(s) for s in (*_INTERESTING_CLASSES, *KNOWN_CLASSES)}
+
+
+# Window categories, in the order they are reported
+CATEGORIES = tuple(map(sys.intern, (
+    'game_state_windows', 'prompt_window', 'main_game_window',
+    'mod_launcher', 'other_spire_windows'
+)))
+
+# Known Text the Spire game state window titles
+_GAME_STATE_TITLES = frozenset(map(sys.intern, (
+    'Player', 'Monster', 'Hand', 'Deck', 'Discard', 
+    'Orbs', 'Relic', 'Output', 'Log'
+)))
+
+# Prompt window for commands (can be titled 'Prompt' or 'info')
+_PROMPT_TITLES = frozenset(map(sys.intern, ('Prompt', 'info')))
+
+
+# Class name -> (category, title test) for the categories that require a
+# specific window class
+_CLASS_RULES = {
+    'LWJGL': ('main_game_window', lambda title: 'Slay the Spire' in title),
+    'SunAwtFrame': ('prompt_window', _PROMPT_TITLES.__contains__),
+    'SWT_Window0': ('game_state_windows', _GAME_STATE_TITLES.__contains__),
+}
+
+
+def window_category(class_name: str, title: str) -> Optional[str]:
+    """Category a window belongs to, or None if it is not a Text the Spire window.
+    
+    One class lookup decides the class-specific categories; the mod launcher
+    and other spire-related windows are matched by title.
+    """
+    rule = _CLASS_RULES.get(class_name)
+    if rule is not None and rule[1](title):
+        return rule[0]
+    
+    if 'ModTheSpire' in title:
+        return 'mod_launcher'
+    
+    if _SPIRE_SUBSTRING_RE.search(title):
+        return 'other_spire_windows'
+    
+    return None
+
+
+def is_spire_candidate(class_name: str, title: str) -> bool:
+    """Check whether a window ends up in one of the Text the Spire categories."""
+    return window_category(class_name, title) is not None
+
+
+def _window_record(hwnd: int, class_name: str, title: str) -> Window:
+    """Build a window record, looking up rect and process id."""
+    try:
+        rect = win32gui.GetWindowRect(hwnd)
+        x, y = rect[0], rect[1]
+        width = rect[2] - rect[0]
+        height = rect[3] - rect[1]
+    except Exception:
+        x = y = width = height = 0
+    
+    try:
+        _, process_id = win32gui.GetWindowThreadProcessId(hwnd)
+    except Exception:
+        process_id = 0
+    
+    return Window(hwnd, title, class_name, width, height, x, y, process_id)
+
+
+def enum_visible_windows(keep: Optional[Callable[[str, str], bool]] = None,
+                         stop: Optional[Callable[[Window], bool]] = None) -> List[Window]:
+    """Enumerate visible top-level windows in a single EnumWindows pass.
+    
+    Class name and title are read first; keep(class_name, title) decides which
+    windows get their rect and process id looked up and are returned. Without
+    a filter every visible window is returned. stop(window) is called for each
+    returned window and ends the enumeration early when it returns True.
+    """
+    windows = []
+    stopped = []
+    
+    def callback(hwnd: int, _) -> bool:
+        if not win32gui.IsWindowVisible(hwnd):
+            return True
         
         try:
-            rect = win32gui.GetWindowRect(hwnd)
-            width = rect[2] - rect[0] 
-            height = rect[3] - rect[1]
-        except:
-            width = height = 0
-            
-        try:
-            _, process_id = win32gui.GetWindowThreadProcessId(hwnd)
-        except:
-            process_id = 0
-            
-        windows.append({
-            'hwnd': hwnd,
-            'title': window_text,
-            'class_name': class_name,
-            'width': width,
-            'height': height,
-            'process_id': process_id
-        })
-    
-    return True
-
-
-def find_text_spire_windows() -> Dict[str, List[Dict]]:
-    """Find and categorize Text the Spire mod windows."""
-    all_windows = []
-    win32gui.EnumWindows(enum_windows_callback, all_windows)
-    
-    categorized = {
-        'game_state_windows': [],
-        'prompt_window': [],
-        'main_game_window': [],
-        'mod_launcher': [],
-        'other_spire_windows': []
-    }
-    
-    # Known Text the Spire game state window titles
-    game_state_titles = {
-        'Player', 'Monster', 'Hand', 'Deck', 'Discard', 
-        'Orbs', 'Relic', 'Output', 'Log'
-    }
-    
-    for window in all_windows:
-        title = window['title']
-        class_name = window['class_name']
-        
-        # Main game window
-        if 'Slay the Spire' in title and class_name == 'LWJGL':
-            categorized['main_game_window'].append(window)
-        
-        # Prompt window for commands (can be titled 'Prompt' or 'info')
-        elif (title in ['Prompt', 'info']) and class_name == 'SunAwtFrame':
-            categorized['prompt_window'].append(window)
+            class_name = win32gui.GetClassName(hwnd)
+            window_text = win32gui.GetWindowText(hwnd)
+        except Exception:
+            # Window went away during enumeration
+            return True
         
-        # Mod launcher
-        elif 'ModTheSpire' in title:
-            categorized['mod_launcher'].append(window)
+        class_name = _CANONICAL.get(class_name, class_name)
+        window_text = _CANONICAL.get(window_text, window_text)
         
-        # Game state windows (Text the Spire mod windows)
-        elif title in game_state_titles and class_name == 'SWT_Window0':
-            categorized['game_state_windows'].append(window)
+        if keep is not None and not keep(class_name, window_text):
+            return True
         
-        # Other potential spire-related windows
-        elif any(keyword in title.lower() for keyword in ['spire', 'text']):
-            categorized['other_spire_windows'].append(window)
+        window = _window_record(hwnd, class_name, window_text)
+        windows.append(window)
+        if stop is not None and stop(window):
+            stopped.append(hwnd)
+            return False
+        return True
+    
+    try:
+        win32gui.EnumWindows(callback, None)
+    except Exception:
+        # Stopping EnumWindows early from the callback is reported as an error
+        if not stopped:
+            raise
+    return windows
+
+
+def _cached_snapshot(ttl: float = 0.25) -> Optional[List[Window]]:
+    """Return the cached candidate windows if the cached pass is younger than ttl seconds, else None."""
+    if _SNAPSHOT_CACHE is not None and time.monotonic() - _SNAPSHOT_CACHE[0] < ttl:
+        return _SNAPSHOT_CACHE[1]
+    return None
+
+
+def _snapshot(ttl: float = 0.25) -> List[Window]:
+    """Return visible candidate windows, re-enumerating only if the cached pass is older than ttl seconds."""
+    global _SNAPSHOT_CACHE
+    
+    windows = _cached_snapshot(ttl)
+    if windows is not None:
+        return windows
+    
+    windows = enum_visible_windows(is_spire_candidate)
+    _SNAPSHOT_CACHE = (time.monotonic(), windows)
+    return windows
+
+
+def invalidate_snapshot() -> None:
+    """Drop the cached enumeration so the next lookup re-enumerates windows."""
+    global _SNAPSHOT_CACHE
+    _SNAPSHOT_CACHE = None
+
+
+def _is_complete(categorized: Dict[str, List[Window]]) -> bool:
+    """Check whether a full Text the Spire session has been found.
+    
+    That is the main game window, a prompt window, the mod launcher and all
+    nine game state windows.
+    """
+    state_windows = categorized['game_state_windows']
+    return (bool(categorized['main_game_window'])
+            and bool(categorized['prompt_window'])
+            and bool(categorized['mod_launcher'])
+            and len(state_windows) >= len(_GAME_STATE_TITLES)
+            and len({w.title for w in state_windows}) == len(_GAME_STATE_TITLES))
+
+
+def find_text_spire_windows(stop_when_complete: bool = False) -> Dict[str, List[Window]]:
+    """Find and categorize Text the Spire mod windows.
+    
+    With stop_when_complete, enumeration stops as soon as a full session
+    has been found; windows after that point are not put in
+    other_spire_windows.
+    """
+    global _SNAPSHOT_CACHE
+    
+    categorized = {category: [] for category in CATEGORIES}
+    
+    def add(window: Window) -> bool:
+        """Categorize one window; True once a full session has been found."""
+        category = window_category(window.class_name, window.title)
+        categorized[category].append(window)
+        return (stop_when_complete and category != 'other_spire_windows'
+                and _is_complete(categorized))
+    
+    all_windows = _cached_snapshot()
+    if all_windows is not None:
+        for window in all_windows:
+            if add(window):
+                break
+        return categorized
+    
+    # Categorize during enumeration so EnumWindows can stop at a full session
+    now = time.monotonic()
+    all_windows = enum_visible_windows(is_spire_candidate, add)
+    if not (stop_when_complete and _is_complete(categorized)):
+        # Only a pass over every window can serve later lookups
+        _SNAPSHOT_CACHE = (now, all_windows)
     
     return categorized
 
 
-def print_categorized_windows(categorized: Dict[str, List[Dict]]) -> None:
+def print_categorized_windows(categorized: Dict[str, List[Window]]) -> None:
     """Print categorized window information."""
+    buf = []
     for category, windows in categorized.items():
         if windows:
-            print(f"\n{category.upper().replace('_', ' ')}")
-            print("=" * len(category))
+            buf.append(f"\n{category.upper().replace('_', ' ')}\n")
+            buf.append("=" * len(category) + "\n")
             
             for i, window in enumerate(windows, 1):
-                print(f"{i}. '{window['title']}' (Handle: {window['hwnd']})")
-                print(f"   Class: {window['class_name']}")
-                print(f"   Size: {window['width']}x{window['height']}")
+                buf.append(f"{i}. '{window.title}' (Handle: {window.hwnd})\n"
+                           f"   Class: {window.class_name}\n"
+                           f"   Size: {window.width}x{window.height}\n")
+    
+    sys.stdout.write(''.join(buf))
+    sys.stdout.flush()
+
+
+def _find_visible_hwnd(title: str) -> int:
+    """FindWindow lookup by exact title (and class, for known titles); 0 if not found or hidden."""
+    try:
+        hwnd = win32gui.FindWindow(KNOWN_CLASSES.get(title), title)
+    except Exception:
+        # pywin32 raises instead of returning 0 when nothing matches
+        return 0
+    
+    if not hwnd or not win32gui.IsWindowVisible(hwnd):
+        return 0
+    return hwnd
+
+
+def find_hwnd_by_title(title: str) -> Optional[int]:
+    """Get the handle of a visible window by exact title, without building a window record.
+    
+    Tries FindWindow first and falls back to an EnumWindows pass that only
+    reads window titles and stops at the first match.
+    """
+    hwnd = _find_visible_hwnd(title)
+    if hwnd:
+        return hwnd
+    
+    found = []
+    
+    def callback(hwnd: int, _) -> bool:
+        if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd) == title:
+            found.append(hwnd)
+            return False
+        return True
+    
+    try:
+        win32gui.EnumWindows(callback, None)
+    except Exception:
+        # Stopping EnumWindows early from the callback is reported as an error
+        if not found:
+            raise
+    
+    return found[0] if found else None
+
+
+def find_window(title: str) -> Optional[Window]:
+    """Look up a visible window by exact title with FindWindow.
+    
+    Known Text the Spire titles are matched together with their window class.
+    Returns None if no such window exists.
+    """
+    hwnd = _find_visible_hwnd(title)
+    if not hwnd:
+        return None
+    
+    try:
+        class_name = win32gui.GetClassName(hwnd)
+    except Exception:
+        return None
+    
+    return _window_record(hwnd, class_name, title)
 
 
-def get_window_by_title(title: str) -> Optional[Dict]:
-    """Find a specific window by title."""
-    all_windows = []
-    win32gui.EnumWindows(enum_windows_callback, all_windows)
+def get_window_by_title(title: str) -> Optional[Window]:
+    """Find a specific Text the Spire window by title."""
+    window = find_window(title)
+    if window is not None:
+        return window
     
-    for window in all_windows:
-        if window['title'] == title:
+    for window in _snapshot():
+        if window.title == title:
             return window
     
     return None
 
 
+def _visible_hwnds_of_class(class_name: str) -> List[int]:
+    """Handles of visible top-level windows of one class, walked with FindWindowEx."""
+    hwnds = []
+    hwnd = 0
+    while True:
+        try:
+            hwnd = win32gui.FindWindowEx(0, hwnd, class_name, None)
+        except Exception:
+            # pywin32 raises when there is no further match
+            break
+        if not hwnd:
+            break
+        if win32gui.IsWindowVisible(hwnd):
+            hwnds.append(hwnd)
+    
+    return hwnds
+
+
+# Category of the known titles with a fixed window class
+_CLASS_CATEGORIES = {'SunAwtFrame': 'prompt_window', 'SWT_Window0': 'game_state_windows'}
+
+
+def find_known_windows() -> Dict[str, List[Window]]:
+    """Categorize the known Text the Spire windows with FindWindow lookups only.
+    
+    Each known (class, title) pair is looked up directly instead of
+    enumerating every top-level window. The mod launcher and other
+    spire-related windows have no fixed title, so those categories stay
+    empty; use find_text_spire_windows() when they are needed.
+    """
+    categorized = {category: [] for category in CATEGORIES}
+    
+    main_window = find_window('Slay the Spire')
+    if main_window is not None:
+        categorized['main_game_window'].append(main_window)
+    else:
+        # The main window title may carry a suffix, so check the LWJGL windows
+        for hwnd in _visible_hwnds_of_class('LWJGL'):
+            title = win32gui.GetWindowText(hwnd)
+            if 'Slay the Spire' in title:
+                categorized['main_game_window'].append(_window_record(hwnd, 'LWJGL', title))
+    
+    for title, class_name in KNOWN_CLASSES.items():
+        category = _CLASS_CATEGORIES.get(class_name)
+        if category is None:
+            continue
+        window = find_window(title)
+        if window is not None:
+            categorized[category].append(window)
+    
+    return categorized
+
+
+def find_known_handles() -> Dict[str, Dict[str, int]]:
+    """Handles of the known Text the Spire windows as {category: {title: hwnd}}.
+    
+    Same lookups as find_known_windows() and find_windows_fast(), but no
+    window records are built, so each window costs one FindWindow call.
+    Categories without windows are left out.
+    """
+    handles = {}
+    
+    hwnd = _find_visible_hwnd('Slay the Spire')
+    if hwnd:
+        handles['main_game_window'] = {'Slay the Spire': hwnd}
+    else:
+        for hwnd in _visible_hwnds_of_class('LWJGL'):
+            title = win32gui.GetWindowText(hwnd)
+            if 'Slay the Spire' in title:
+                handles.setdefault('main_game_window', {})[title] = hwnd
+    
+    for title, class_name in KNOWN_CLASSES.items():
+        category = _CLASS_CATEGORIES.get(class_name)
+        if category is None:
+            continue
+        hwnd = _find_visible_hwnd(title)
+        if hwnd:
+            handles.setdefault(category, {})[title] = hwnd
+    
+    if not handles:
+        for category, windows in find_text_spire_windows().items():
+            if windows:
+                handles[category] = {w.title: w.hwnd for w in windows}
+    
+    return handles
+
+
+def find_windows_fast() -> Dict[str, List[Window]]:
+    """Categorized windows from direct lookups, falling back to enumeration if none are found."""
+    categorized = find_known_windows()
+    if any(categorized.values()):
+        return categorized
+    return find_text_spire_windows(stop_when_complete=True)
+
+
 def main():
     """Main function to find and display Text the Spire windows."""
     print("Searching for Text the Spire windows...")
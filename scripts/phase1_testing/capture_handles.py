@@ -2,16 +2,138 @@
 """
 Capture current window handles for persistence testing.
 Run this script before and after restarting Text the Spire to compare handles.
+
+Captures are appended to an append-only JSON lines log (handles.wal). The first
+capture of a session is stored in full, later captures of the same session only
+store the windows that were added, removed or changed since the previous one.
 """
 
 import json
+import mmap
 import os
 from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from find_text_spire_windows import find_text_spire_windows
 
 
+WAL_FILENAME = "handles.wal"
+
+# Parsed JSON handle files as {path: (mtime_ns, snapshot)}
+_FILE_CACHE = {}
+
+
+def wal_path():
+    """Path of the handle capture log next to this script."""
+    return os.path.join(os.path.dirname(__file__), WAL_FILENAME)
+
+
+def read_wal(path=None):
+    """Read all records from the capture log."""
+    path = path or wal_path()
+    if not os.path.isfile(path):
+        return []
+    
+    records = []
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+
+def diff_handles(old, new):
+    """Compute the delta that turns one handles dict into another."""
+    delta = {'added': {}, 'removed': {}, 'changed': {}}
+    
+    for category in old.keys() | new.keys():
+        old_windows = {w['title']: w for w in old.get(category, [])}
+        new_windows = {w['title']: w for w in new.get(category, [])}
+        
+        added = [w for title, w in new_windows.items() if title not in old_windows]
+        removed = [title for title in old_windows if title not in new_windows]
+        changed = [w for title, w in new_windows.items()
+                   if title in old_windows and old_windows[title] != w]
+        
+        if added:
+            delta['added'][category] = added
+        if removed:
+            delta['removed'][category] = removed
+        if changed:
+            delta['changed'][category] = changed
+    
+    return delta
+
+
+def apply_delta(handles, delta):
+    """Apply a delta produced by diff_handles to a handles dict."""
+    result = {category: {w['title']: w for w in windows}
+              for category, windows in handles.items()}
+    
+    for category, titles in delta['removed'].items():
+        for title in titles:
+            result.get(category, {}).pop(title, None)
+    for key in ('added', 'changed'):
+        for category, windows in delta[key].items():
+            for window in windows:
+                result.setdefault(category, {})[window['title']] = window
+    
+    return {category: list(windows.values())
+            for category, windows in result.items() if windows}
+
+
+def replay_session(session_name, records=None):
+    """Rebuild the latest snapshot of a session from the capture log."""
+    if records is None:
+        records = read_wal()
+    
+    snapshot = None
+    for record in records:
+        if record['session'] != session_name:
+            continue
+        if 'full' in record:
+            handles = record['full']
+        elif snapshot is not None:
+            handles = apply_delta(snapshot['handles'], record['delta'])
+        else:
+            # Delta without a preceding full snapshot, skip it
+            continue
+        snapshot = {
+            'timestamp': record['timestamp'],
+            'session_name': session_name,
+            'handles': handles
+        }
+    
+    return snapshot
+
+
+def compact_wal(path=None):
+    """Rewrite the capture log keeping only the latest full snapshot per session."""
+    path = path or wal_path()
+    records = read_wal(path)
+    
+    sessions = list(dict.fromkeys(record['session'] for record in records))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        for session_name in sessions:
+            snapshot = replay_session(session_name, records)
+            if snapshot is None:
+                continue
+            f.write(json.dumps({
+                'session': session_name,
+                'timestamp': snapshot['timestamp'],
+                'full': snapshot['handles']
+            }) + "\n")
+    os.replace(tmp_path, path)
+    
+    print(f"[OK] Compacted {len(records)} records into {len(sessions)} sessions")
+
+
 def capture_and_save_handles(session_name="session"):
-    """Capture current handles and save to file."""
+    """Capture current handles and append them to the capture log."""
     print(f"Capturing handles for {session_name}...")
     
     categorized = find_text_spire_windows()
@@ -25,11 +147,11 @@ def capture_and_save_handles(session_name="session"):
             handles_info[category] = []
             for window in windows:
                 handles_info[category].append({
-                    'title': window['title'],
-                    'handle': window['hwnd'],
-                    'class_name': window['class_name'],
-                    'size': f"{window['width']}x{window['height']}",
-                    'process_id': window['process_id']
+                    'title': window.title,
+                    'handle': window.hwnd,
+                    'class_name': window.class_name,
+                    'size': f"{window.width}x{window.height}",
+                    'process_id': window.process_id
                 })
             total_windows += len(windows)
     
@@ -38,76 +160,138 @@ def capture_and_save_handles(session_name="session"):
         print("Make sure Text the Spire with Text the Spire mod is running.")
         return None
     
-    # Save to file
+    # Append to the capture log, storing only the delta after the first capture
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"handles_{session_name}_{timestamp}.json"
-    filepath = os.path.join(os.path.dirname(__file__), filename)
+    filepath = wal_path()
     
-    snapshot = {
-        'timestamp': timestamp,
-        'session_name': session_name,
-        'handles': handles_info
-    }
+    record = {'session': session_name, 'timestamp': timestamp}
+    previous = replay_session(session_name)
+    if previous is None:
+        record['full'] = handles_info
+    else:
+        record['delta'] = diff_handles(previous['handles'], handles_info)
     
-    with open(filepath, 'w') as f:
-        json.dump(snapshot, f, indent=2)
+    with open(filepath, 'a') as f:
+        f.write(json.dumps(record) + "\n")
     
     print(f"[OK] Captured {total_windows} windows:")
     for category, windows in handles_info.items():
         print(f"  {category.replace('_', ' ').title()}: {len(windows)}")
     
-    print(f"[OK] Saved to: {filename}")
+    kind = 'full snapshot' if 'full' in record else 'delta'
+    print(f"[OK] Appended {kind} for session '{session_name}' to: {WAL_FILENAME}")
     return filepath
 
 
+def _parse_json(data):
+    """Parse JSON from a bytes-like buffer, with orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def load_snapshot_file(path):
+    """Load a JSON handle file, reusing the parsed result while the file is unchanged.
+    
+    The file is memory-mapped for reading; the cached entry is replaced as
+    soon as the file's modification time changes.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            snapshot = _parse_json(b'')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    snapshot = _parse_json(view)
+    
+    _FILE_CACHE[path] = (mtime_ns, snapshot)
+    return snapshot
+
+
+def load_snapshot(ref):
+    """Load a snapshot from a JSON handle file or, failing that, a session in the capture log.
+    
+    Returns None if there is neither such a file nor such a session.
+    """
+    if os.path.isfile(ref):
+        return load_snapshot_file(ref)
+    if ref.endswith('.json'):
+        return None
+    
+    return replay_session(ref)
+
+
+def diff_snapshots(snap1, snap2):
+    """Compute the handle differences between two snapshots, per category.
+    
+    Returns a dict with 'added' and 'removed' ({category: {title: handle}}),
+    'handle_changed' ({category: {title: (old_handle, new_handle)}}) and
+    'stable' (number of windows whose handle did not change). Categories
+    without differences are left out.
+    """
+    handles1 = snap1['handles']
+    handles2 = snap2['handles']
+    diff = {'added': {}, 'removed': {}, 'handle_changed': {}, 'stable': 0}
+    
+    for category in handles1.keys() | handles2.keys():
+        idx1 = {w['title']: w['handle'] for w in handles1.get(category, [])}
+        idx2 = {w['title']: w['handle'] for w in handles2.get(category, [])}
+        if idx1 == idx2:
+            diff['stable'] += len(idx1)
+            continue
+        
+        added = {t: h for t, h in idx2.items() if t not in idx1}
+        removed = {t: h for t, h in idx1.items() if t not in idx2}
+        changed = {t: (h1, idx2[t]) for t, h1 in idx1.items()
+                   if t in idx2 and idx2[t] != h1}
+        diff['stable'] += len(idx1) - len(removed) - len(changed)
+        
+        if added:
+            diff['added'][category] = added
+        if removed:
+            diff['removed'][category] = removed
+        if changed:
+            diff['handle_changed'][category] = changed
+    
+    return diff
+
+
 def compare_two_files(file1, file2):
-    """Compare two handle files."""
-    def load_snapshot(path):
-        with open(path, 'r') as f:
-            return json.load(f)
-    
-    try:
-        snap1 = load_snapshot(file1)
-        snap2 = load_snapshot(file2)
-    except FileNotFoundError as e:
-        print(f"File not found: {e}")
-        return
+    """Compare two handle files or captured sessions."""
+    snap1 = load_snapshot(file1)
+    snap2 = load_snapshot(file2)
+    for ref, snap in ((file1, snap1), (file2, snap2)):
+        if snap is None:
+            print(f"File not found: no handle file or captured session named '{ref}'")
+            return None
     
     print(f"\nCOMPARING HANDLES:")
     print(f"File 1: {snap1['session_name']} ({snap1['timestamp']})")
     print(f"File 2: {snap2['session_name']} ({snap2['timestamp']})")
     print("=" * 50)
     
-    handles1 = snap1['handles']
-    handles2 = snap2['handles']
-    
-    all_stable = True
+    diff = diff_snapshots(snap1, snap2)
+    categories = diff['added'].keys() | diff['removed'].keys() | diff['handle_changed'].keys()
     
-    for category in set(handles1.keys()) | set(handles2.keys()):
+    for category in sorted(categories):
         print(f"\n{category.upper().replace('_', ' ')}:")
         
-        if category not in handles1 or category not in handles2:
-            print(f"  Category missing in one session")
-            all_stable = False
-            continue
-        
-        windows1 = handles1[category]
-        windows2 = handles2[category]
-        
-        # Match by title and compare handles
-        for w1 in windows1:
-            matching = next((w for w in windows2 if w['title'] == w1['title']), None)
-            if matching:
-                if w1['handle'] == matching['handle']:
-                    print(f"  [OK] {w1['title']}: STABLE ({w1['handle']})")
-                else:
-                    print(f"  [!!] {w1['title']}: CHANGED ({w1['handle']} -> {matching['handle']})")
-                    all_stable = False
-            else:
-                print(f"  ? {w1['title']}: Not found in second session")
-                all_stable = False
-    
-    print(f"\nRESULT: Handles are {'STABLE' if all_stable else 'UNSTABLE'}")
+        for title, (old, new) in diff['handle_changed'].get(category, {}).items():
+            print(f"  [!!] {title}: CHANGED ({old} -> {new})")
+        for title in diff['removed'].get(category, {}):
+            print(f"  ? {title}: Not found in second session")
+        for title, handle in diff['added'].get(category, {}).items():
+            print(f"  + {title}: New in second session ({handle})")
+    
+    all_stable = not categories
+    print(f"\n[OK] {diff['stable']} window(s) kept the same handle")
+    print(f"RESULT: Handles are {'STABLE' if all_stable else 'UNSTABLE'}")
     return all_stable
 
 
@@ -119,12 +303,13 @@ def main():
         print("Handle Persistence Testing Tool")
         print("Usage:")
         print("  python capture_handles.py capture <session_name>")
-        print("  python capture_handles.py compare <file1> <file2>")
+        print("  python capture_handles.py compare <session_or_file1> <session_or_file2>")
+        print("  python capture_handles.py compact")
         print("\nExample workflow:")
         print("  1. python capture_handles.py capture before_restart")
         print("  2. [Restart Text the Spire]")
         print("  3. python capture_handles.py capture after_restart")
-        print("  4. python capture_handles.py compare handles_before_restart_*.json handles_after_restart_*.json")
+        print("  4. python capture_handles.py compare before_restart after_restart")
         return
     
     command = sys.argv[1]
@@ -135,10 +320,13 @@ def main():
     
     elif command == "compare":
         if len(sys.argv) < 4:
-            print("Usage: python capture_handles.py compare <file1> <file2>")
+            print("Usage: python capture_handles.py compare <session_or_file1> <session_or_file2>")
             return
         compare_two_files(sys.argv[2], sys.argv[3])
     
+    elif command == "compact":
+        compact_wal()
+    
     else:
         print(f"Unknown command: {command}")
 
@@ -5,39 +5,57 @@ Check the Log window content to verify command was received.
 
 import sys
 import os
+import win32gui
 from pywinauto import Application
 
 # Add scripts directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../scripts'))
 
-from reliable_window_finder import TextTheSpireWindowFinder
+from find_text_spire_windows import find_hwnd_by_title
+from window_reader import read_windows_parallel, window_text
+
+# Last known Log window handle and its pywinauto window, reused while the handle stays valid
+_LAST_LOG_HWND = None
+_LOG_WINDOW = None
+
+def get_log_hwnd():
+    """Get the Log window handle, re-enumerating only when the cached handle is no longer valid."""
+    global _LAST_LOG_HWND, _LOG_WINDOW
+    
+    if (_LAST_LOG_HWND and win32gui.IsWindow(_LAST_LOG_HWND) and
+            win32gui.GetWindowText(_LAST_LOG_HWND) == 'Log'):
+        return _LAST_LOG_HWND
+    
+    _LAST_LOG_HWND = find_hwnd_by_title('Log')
+    _LOG_WINDOW = None
+    return _LAST_LOG_HWND
+
+def get_log_window(hwnd):
+    """Get the pywinauto window for the Log window, connecting only once per handle."""
+    global _LOG_WINDOW
+    
+    if _LOG_WINDOW is None:
+        app = Application().connect(handle=hwnd)
+        _LOG_WINDOW = app.window(handle=hwnd)
+    return _LOG_WINDOW
 
 def check_log_window():
     """Check Log window content."""
-    finder = TextTheSpireWindowFinder()
+    global _LOG_WINDOW
     
     # Get Log window
-    log_window = finder.get_window_by_title('Log')
-    if not log_window:
+    log_hwnd = get_log_hwnd()
+    if not log_hwnd:
         print("[ERROR] Log window not found")
         return False
     
-    print(f"[OK] Found Log window (Handle: {log_window['hwnd']})")
+    print(f"[OK] Found Log window (Handle: {log_hwnd})")
     
     try:
-        # Connect and read content
-        app = Application().connect(handle=log_window['hwnd'])
-        window = app.window(handle=log_window['hwnd'])
-        
-        # Extract text using proven method
-        children = window.children()
-        all_text = []
-        for child in children:
-            child_text = child.window_text()
-            if child_text.strip():
-                all_text.append(child_text)
-        
-        log_content = '\n'.join(all_text).strip()
+        # Read content over the cached connection, using the shared window reader
+        contents = read_windows_parallel(
+            [log_hwnd], reader=lambda hwnd: window_text(get_log_window(hwnd)))
+        log_content = contents[log_hwnd]
         
         print("\n=== LOG WINDOW CONTENT ===")
         print(log_content)
@@ -52,6 +70,8 @@ def check_log_window():
             return False
         
     except Exception as e:
+        # Reconnect on the next call in case the cached connection went stale
+        _LOG_WINDOW = None
         print(f"[ERROR] Failed to read log: {e}")
         return False
 
@@ -4,71 +4,54 @@ Window enumeration script using win32api.
 Part of Phase 1 feasibility testing for Text the Spire interaction.
 """
 
-import win32gui
-import win32con
-import win32api
-from typing import List, Dict, Tuple
+from typing import List, Tuple
+import re
 import sys
+from find_text_spire_windows import Window, WindowTable, enum_visible_windows, window_table
 
 
-def enum_windows_callback(hwnd: int, windows: List[Dict]) -> bool:
-    """Callback function for EnumWindows to collect window information."""
-    if win32gui.IsWindowVisible(hwnd):
-        window_text = win32gui.GetWindowText(hwnd)
-        class_name = win32gui.GetClassName(hwnd)
-        
-        # Get window rect for size info
-        try:
-            rect = win32gui.GetWindowRect(hwnd)
-            width = rect[2] - rect[0]
-            height = rect[3] - rect[1]
-        except:
-            width = height = 0
-            
-        # Get process ID
-        try:
-            _, process_id = win32gui.GetWindowThreadProcessId(hwnd)
-        except:
-            process_id = 0
-            
-        windows.append({
-            'hwnd': hwnd,
-            'title': window_text,
-            'class_name': class_name,
-            'width': width,
-            'height': height,
-            'process_id': process_id
-        })
-    
-    return True
+def enumerate_all_windows() -> List[Window]:
+    """Enumerate all visible windows on the system."""
+    return enum_visible_windows()
 
 
-def enumerate_all_windows() -> List[Dict]:
-    """Enumerate all visible windows on the system."""
-    windows = []
-    win32gui.EnumWindows(enum_windows_callback, windows)
-    return windows
+def enumerate_all_windows_soa() -> WindowTable:
+    """Enumerate all visible windows as parallel columns."""
+    return window_table(enumerate_all_windows())
+
+
+# Keywords that suggest a window belongs to Text the Spire
+SPIRE_KEYWORDS = ('text', 'spire', 'slay', 'prompt', 'accessibility')
+
+# Matches any of the keywords in a single scan of the string
+_SPIRE_KEYWORD_RE = re.compile('|'.join(map(re.escape, SPIRE_KEYWORDS)))
 
 
-def filter_text_spire_windows(windows: List[Dict]) -> List[Dict]:
+def text_spire_indexes(table: WindowTable) -> List[int]:
+    """Indexes of windows whose title or class mentions a Text the Spire keyword."""
+    search = _SPIRE_KEYWORD_RE.search
+    titles_lower = list(map(str.lower, table.titles))
+    classes_lower = list(map(str.lower, table.classes))
+    return [
+        i for i, (title_lower, class_lower) in enumerate(zip(titles_lower, classes_lower))
+        if search(title_lower) or search(class_lower)
+    ]
+
+
+def filter_text_spire_windows(windows: List[Window]) -> List[Window]:
     """Filter windows that might be related to Text the Spire mod."""
-    text_spire_windows = []
-    
-    for window in windows:
-        title_lower = window['title'].lower()
-        class_lower = window['class_name'].lower()
-        
-        # Look for Text the Spire related keywords
-        spire_keywords = ['text', 'spire', 'slay', 'prompt', 'accessibility']
-        
-        if any(keyword in title_lower for keyword in spire_keywords) or \
-           any(keyword in class_lower for keyword in spire_keywords):
-            text_spire_windows.append(window)
-    
-    return text_spire_windows
+    return [windows[i] for i in text_spire_indexes(window_table(windows))]
+
+
+def split_windows(windows: List[Window]) -> Tuple[List[Window], List[Window]]:
+    """Split windows into Text the Spire candidates and windows with titles."""
+    table = window_table(windows)
+    text_spire_windows = [windows[i] for i in text_spire_indexes(table)]
+    non_empty_windows = [windows[i] for i, title in enumerate(table.titles) if title.strip()]
+    return text_spire_windows, non_empty_windows
 
 
-def print_window_info(windows: List[Dict], title: str = "") -> None:
+def print_window_info(windows: List[Window], title: str = "") -> None:
     """Print formatted window information."""
     if title:
         print(f"\n{title}")
@@ -79,11 +62,11 @@ def print_window_info(windows: List[Dict], title: str = "") -> None:
         return
         
     for i, window in enumerate(windows, 1):
-        print(f"\n{i}. Handle: {window['hwnd']}")
-        print(f"   Title: '{window['title']}'")
-        print(f"   Class: '{window['class_name']}'")
-        print(f"   Size: {window['width']}x{window['height']}")
-        print(f"   PID: {window['process_id']}")
+        print(f"\n{i}. Handle: {window.hwnd}")
+        print(f"   Title: '{window.title}'")
+        print(f"   Class: '{window.class_name}'")
+        print(f"   Size: {window.width}x{window.height}")
+        print(f"   PID: {window.process_id}")
 
 
 def main():
@@ -94,8 +77,8 @@ def main():
         all_windows = enumerate_all_windows()
         print(f"Found {len(all_windows)} visible windows total.")
         
-        # Filter for potential Text the Spire windows
-        text_spire_windows = filter_text_spire_windows(all_windows)
+        # Filter for potential Text the Spire windows and titled windows together
+        text_spire_windows, non_empty_windows = split_windows(all_windows)
         
         if text_spire_windows:
             print_window_info(text_spire_windows, "Potential Text the Spire Windows")
@@ -104,7 +87,6 @@ def main():
             print("Make sure the Text the Spire mod is running.")
             
         # Also show all windows with non-empty titles for reference
-        non_empty_windows = [w for w in all_windows if w['title'].strip()]
         print_window_info(non_empty_windows[:20], "Sample of All Windows (first 20)")
         
         if len(non_empty_windows) > 20:
@@ -10,51 +10,63 @@ Searches for:
 4. Any other windows that could be the prompt window
 """
 
-import win32gui
+from functools import lru_cache
 from typing import List, Dict, Optional
+import re
 import sys
+from find_text_spire_windows import Window, enum_visible_windows, window_table
 
 
-def enum_windows_callback(hwnd: int, windows: List[Dict]) -> bool:
-    """Callback function for EnumWindows to collect ALL window information."""
-    if win32gui.IsWindowVisible(hwnd):
-        window_text = win32gui.GetWindowText(hwnd)
-        class_name = win32gui.GetClassName(hwnd)
-        
-        try:
-            rect = win32gui.GetWindowRect(hwnd)
-            width = rect[2] - rect[0] 
-            height = rect[3] - rect[1]
-            x = rect[0]
-            y = rect[1]
-        except:
-            width = height = x = y = 0
-            
-        try:
-            _, process_id = win32gui.GetWindowThreadProcessId(hwnd)
-        except:
-            process_id = 0
-            
-        # Only include windows that have some title or are relevant classes
-        if window_text or class_name in ['SunAwtFrame', 'SWT_Window0', 'LWJGL']:
-            windows.append({
-                'hwnd': hwnd,
-                'title': window_text,
-                'class_name': class_name,
-                'width': width,
-                'height': height,
-                'x': x,
-                'y': y,
-                'process_id': process_id
-            })
-    
-    return True
+# Window classes used by Slay the Spire and the Text the Spire mod
+_RELEVANT_CLASSES = frozenset({'SunAwtFrame', 'SWT_Window0', 'LWJGL'})
+
+# Known game state titles that should NOT be the prompt window
+_GAME_STATE_TITLES = frozenset({
+    'Player', 'Monster', 'Hand', 'Deck', 'Discard', 
+    'Orbs', 'Relic', 'Output', 'Log'
+})
+
+
+def is_info_candidate(class_name: str, title: str) -> bool:
+    """Only include windows that have some title or are relevant classes."""
+    return bool(title) or class_name in _RELEVANT_CLASSES
+
+
+# Size class bits, computed once per distinct size by size_mask()
+SIZE_PROMPT_WIDTH = 1 << 0    # 250 <= width <= 400
+SIZE_PROMPT_HEIGHT = 1 << 1   # 80 <= height <= 150
+SIZE_NARROW = 1 << 2          # width < 500
+SIZE_SHORT = 1 << 3           # height < 300
+SIZE_SMALL = 1 << 4           # width < 500 and height < 300
 
+# Size similar to the original 300x100 prompt (allowing some variance)
+SIZE_PROMPT_SIZED = SIZE_PROMPT_WIDTH | SIZE_PROMPT_HEIGHT
 
-def find_potential_info_windows() -> Dict[str, List[Dict]]:
+
+@lru_cache(maxsize=None)
+def size_mask(width: int, height: int) -> int:
+    """Classify a window size into a bitmask of the size brackets used below."""
+    narrow = width < 500
+    short = height < 300
+    return ((250 <= width <= 400)
+            | (80 <= height <= 150) << 1
+            | narrow << 2
+            | short << 3
+            | (narrow and short) << 4)
+
+
+def window_size_mask(window: Window) -> int:
+    """Get the size mask of a window."""
+    return size_mask(window.width, window.height)
+
+
+# Title keywords of spire-related windows, matched in a single scan
+_SPIRE_RELATED_RE = re.compile('spire|text|mod')
+
+
+def find_potential_info_windows() -> Dict[str, List[Window]]:
     """Find windows that might be the renamed prompt window."""
-    all_windows = []
-    win32gui.EnumWindows(enum_windows_callback, all_windows)
+    all_windows = enum_visible_windows(is_info_candidate)
     
     candidates = {
         'info_titled_windows': [],
@@ -65,20 +77,17 @@ def find_potential_info_windows() -> Dict[str, List[Dict]]:
         'other_candidates': []
     }
     
-    # Known game state titles that should NOT be the prompt window
-    game_state_titles = {
-        'Player', 'Monster', 'Hand', 'Deck', 'Discard', 
-        'Orbs', 'Relic', 'Output', 'Log'
-    }
+    # Derive each column once and test the predicates against the columns
+    table = window_table(all_windows)
+    titles = [title.strip() for title in table.titles]
+    titles_lower = list(map(str.lower, titles))
+    size_masks = list(map(size_mask, table.widths, table.heights))
     
-    for window in all_windows:
-        title = window['title'].strip()
-        class_name = window['class_name']
-        width = window['width']
-        height = window['height']
+    for window, title, title_lower, class_name, sizes in zip(
+            all_windows, titles, titles_lower, table.classes, size_masks):
         
         # Windows with "info" in title (case insensitive)
-        if 'info' in title.lower():
+        if 'info' in title_lower:
             candidates['info_titled_windows'].append(window)
         
         # All SunAwtFrame windows (original prompt was this class)
@@ -86,107 +95,123 @@ def find_potential_info_windows() -> Dict[str, List[Dict]]:
             candidates['sunawtframe_windows'].append(window)
         
         # SWT_Window0 windows that are small (might have changed from game state to prompt)
-        if class_name == 'SWT_Window0' and width < 500 and height < 300:
+        if class_name == 'SWT_Window0' and sizes & SIZE_SMALL:
             candidates['small_swt_windows'].append(window)
         
         # Windows with size similar to original prompt (300x100, allow some variance)
-        if (250 <= width <= 400) and (80 <= height <= 150):
+        if sizes & SIZE_PROMPT_SIZED == SIZE_PROMPT_SIZED:
             candidates['prompt_sized_windows'].append(window)
         
         # Any spire-related windows
-        if any(keyword in title.lower() for keyword in ['spire', 'text', 'mod']):
+        if _SPIRE_RELATED_RE.search(title_lower):
             candidates['all_spire_related'].append(window)
         
         # Other potential candidates (small windows with short titles)
-        if (title and len(title) <= 10 and width < 500 and height < 300 and 
-            title not in game_state_titles):
+        if (title and len(title) <= 10 and sizes & SIZE_SMALL and 
+            title not in _GAME_STATE_TITLES):
             candidates['other_candidates'].append(window)
     
     return candidates
 
 
-def print_candidate_analysis(candidates: Dict[str, List[Dict]]) -> None:
+def print_candidate_analysis(candidates: Dict[str, List[Window]]) -> None:
     """Print detailed analysis of potential prompt window candidates."""
     print("ANALYSIS OF POTENTIAL PROMPT WINDOW CANDIDATES")
     print("=" * 50)
     
+    buf = []
     for category, windows in candidates.items():
         if windows:
-            print(f"\n{category.upper().replace('_', ' ')} ({len(windows)} found)")
-            print("-" * 40)
+            buf.append(f"\n{category.upper().replace('_', ' ')} ({len(windows)} found)\n")
+            buf.append("-" * 40 + "\n")
             
             for i, window in enumerate(windows, 1):
-                print(f"{i}. Title: '{window['title']}'")
-                print(f"   Handle: {window['hwnd']}")
-                print(f"   Class: {window['class_name']}")
-                print(f"   Size: {window['width']}x{window['height']}")
-                print(f"   Position: ({window['x']}, {window['y']})")
-                print(f"   Process ID: {window['process_id']}")
+                buf.append(f"{i}. Title: '{window.title}'\n"
+                           f"   Handle: {window.hwnd}\n"
+                           f"   Class: {window.class_name}\n"
+                           f"   Size: {window.width}x{window.height}\n"
+                           f"   Position: ({window.x}, {window.y})\n"
+                           f"   Process ID: {window.process_id}\n")
                 
                 # Add analysis notes
-                if window['class_name'] == 'SunAwtFrame':
-                    print("   [ANALYSIS] Same class as original Prompt window!")
-                if 'info' in window['title'].lower():
-                    print("   [ANALYSIS] Contains 'info' - likely candidate!")
-                if 250 <= window['width'] <= 400 and 80 <= window['height'] <= 150:
-                    print("   [ANALYSIS] Size similar to original Prompt (300x100)")
+                if window.class_name == 'SunAwtFrame':
+                    buf.append("   [ANALYSIS] Same class as original Prompt window!\n")
+                if 'info' in window.title.lower():
+                    buf.append("   [ANALYSIS] Contains 'info' - likely candidate!\n")
+                if window_size_mask(window) & SIZE_PROMPT_SIZED == SIZE_PROMPT_SIZED:
+                    buf.append("   [ANALYSIS] Size similar to original Prompt (300x100)\n")
                 
-                print()
+                buf.append("\n")
+    
+    sys.stdout.write(''.join(buf))
+    sys.stdout.flush()
+
 
+# Candidate features as (score, reason), indexed by bit position in the feature mask
+_FEATURES = (
+    (10, "Contains 'info' in title"),
+    (8, "SunAwtFrame class (same as original Prompt)"),
+    (5, "Size {width}x{height} similar to original 300x100"),
+    (2, "Short title"),
+    (1, "Small window size"),
+)
 
-def find_best_candidates(candidates: Dict[str, List[Dict]]) -> List[Dict]:
-    """Analyze and rank the best candidates for the prompt window."""
-    all_candidates = []
+# Total score for every possible feature mask
+_SCORE_TABLE = tuple(
+    sum(score for bit, (score, _) in enumerate(_FEATURES) if mask & (1 << bit))
+    for mask in range(1 << len(_FEATURES))
+)
+
+
+def candidate_features(window: Window) -> int:
+    """Pack the prompt-window features of a candidate into a bitmask."""
+    title = window.title
+    sizes = window_size_mask(window)
+    
+    return (int('info' in title.lower())                                   # bit 0
+            | int(window.class_name == 'SunAwtFrame') << 1                 # bit 1
+            | int(sizes & SIZE_PROMPT_SIZED == SIZE_PROMPT_SIZED) << 2     # bit 2
+            | int(bool(title) and len(title) <= 10) << 3                   # bit 3
+            | int(bool(sizes & SIZE_SMALL)) << 4)                          # bit 4
+
+
+def feature_reasons(features: int, window: Window) -> List[str]:
+    """Human readable reasons for the features set in a feature mask."""
+    return [
+        reason.format(width=window.width, height=window.height)
+        for bit, (_, reason) in enumerate(_FEATURES) if features & (1 << bit)
+    ]
+
+
+def find_best_candidates(candidates: Dict[str, List[Window]], top_k: int = 5) -> List[Dict]:
+    """Analyze and rank the best candidates for the prompt window.
     
-    # Collect all unique candidates
+    Reasons are only built for the top_k candidates; the rest have reasons set to None.
+    """
+    scored_candidates = []
+    
+    # Deduplicate and score all candidates in one pass
     seen_handles = set()
     for windows in candidates.values():
         for window in windows:
-            if window['hwnd'] not in seen_handles:
-                all_candidates.append(window)
-                seen_handles.add(window['hwnd'])
-    
-    # Score each candidate
-    scored_candidates = []
-    for window in all_candidates:
-        score = 0
-        reasons = []
-        
-        # High score for "info" in title
-        if 'info' in window['title'].lower():
-            score += 10
-            reasons.append("Contains 'info' in title")
-        
-        # High score for SunAwtFrame class (same as original)
-        if window['class_name'] == 'SunAwtFrame':
-            score += 8
-            reasons.append("SunAwtFrame class (same as original Prompt)")
-        
-        # Medium score for size similarity to original prompt
-        width, height = window['width'], window['height']
-        if 250 <= width <= 400 and 80 <= height <= 150:
-            score += 5
-            reasons.append(f"Size {width}x{height} similar to original 300x100")
-        
-        # Small bonus for short titles (prompt windows typically have short names)
-        if window['title'] and len(window['title']) <= 10:
-            score += 2
-            reasons.append("Short title")
-        
-        # Small bonus for being small window (prompts are typically small)
-        if width < 500 and height < 300:
-            score += 1
-            reasons.append("Small window size")
-        
-        scored_candidates.append({
-            'window': window,
-            'score': score,
-            'reasons': reasons
-        })
+            if window.hwnd in seen_handles:
+                continue
+            seen_handles.add(window.hwnd)
+            
+            features = candidate_features(window)
+            scored_candidates.append({
+                'window': window,
+                'score': _SCORE_TABLE[features],
+                'features': features,
+                'reasons': None
+            })
     
     # Sort by score (highest first)
     scored_candidates.sort(key=lambda x: x['score'], reverse=True)
     
+    for candidate in scored_candidates[:top_k]:
+        candidate['reasons'] = feature_reasons(candidate['features'], candidate['window'])
+    
     return scored_candidates
 
 
@@ -217,10 +242,10 @@ def main():
         reasons = candidate['reasons']
         
         print(f"\n{i}. CANDIDATE (Score: {score})")
-        print(f"   Title: '{window['title']}'")
-        print(f"   Handle: {window['hwnd']}")
-        print(f"   Class: {window['class_name']}")
-        print(f"   Size: {window['width']}x{window['height']}")
+        print(f"   Title: '{window.title}'")
+        print(f"   Handle: {window.hwnd}")
+        print(f"   Class: {window.class_name}")
+        print(f"   Size: {window.width}x{window.height}")
         print(f"   Reasons: {', '.join(reasons)}")
         
         if score >= 10:
@@ -237,7 +262,7 @@ def main():
     top_candidate = best_candidates[0] if best_candidates else None
     if top_candidate and top_candidate['score'] >= 8:
         window = top_candidate['window']
-        print(f"RECOMMENDED: '{window['title']}' (Handle: {window['hwnd']}) - {window['class_name']}")
+        print(f"RECOMMENDED: '{window.title}' (Handle: {window.hwnd}) - {window.class_name}")
     else:
         print("No high-confidence candidates found. Manual verification needed.")
 
@@ -5,45 +5,98 @@ Tests if handles remain stable while playing (without restarting the game).
 """
 
 import time
-from datetime import datetime
-from find_text_spire_windows import find_text_spire_windows
+import win32gui
+from find_text_spire_windows import CATEGORIES, find_known_handles
+from window_events import start_watcher
+
+
+# Last formatted wall-clock second, reused until the second changes
+_last_second = -1
+_last_hms = ""
+
+
+def now_hms():
+    """Current local time as HH:MM:SS, formatted at most once per second."""
+    global _last_second, _last_hms
+    
+    second = int(time.time())
+    if second != _last_second:
+        _last_hms = time.strftime("%H:%M:%S", time.localtime(second))
+        _last_second = second
+    return _last_hms
+
+
+# Index of each category in CATEGORIES, used as the sort key of snapshot entries
+CATEGORY_IDS = {category: i for i, category in enumerate(CATEGORIES)}
+
+
+def flatten_handles(handles):
+    """Flatten {category: {title: hwnd}} into a sorted list of (category_id, title, hwnd)."""
+    return sorted(
+        (CATEGORY_IDS[category], title, hwnd)
+        for category, titles in handles.items()
+        for title, hwnd in titles.items()
+    )
+
+
+def snapshot_fingerprint(snapshot):
+    """Hash of a flat snapshot, for a quick equality check."""
+    return hash(tuple(snapshot))
 
 
 def capture_handle_snapshot():
-    """Capture a quick snapshot of current handles."""
-    categorized = find_text_spire_windows()
-    
-    snapshot = {}
-    for category, windows in categorized.items():
-        if windows:
-            snapshot[category] = [(w['title'], w['hwnd']) for w in windows]
+    """Capture a quick snapshot of current handles as (sorted [(category_id, title, hwnd)], fingerprint)."""
+    snapshot = flatten_handles(find_known_handles())
+    return snapshot, snapshot_fingerprint(snapshot)
+
+
+def diff_flat_snapshots(snap1, snap2):
+    """Diff two sorted flat snapshots in one merge pass.
+    
+    Returns (added, removed, changed): added and removed hold snapshot
+    entries, changed holds (category_id, title, old_hwnd, new_hwnd).
+    """
+    added, removed, changed = [], [], []
+    i = j = 0
+    
+    while i < len(snap1) and j < len(snap2):
+        category1, title1, hwnd1 = snap1[i]
+        category2, title2, hwnd2 = snap2[j]
+        if (category1, title1) == (category2, title2):
+            if hwnd1 != hwnd2:
+                changed.append((category1, title1, hwnd1, hwnd2))
+            i += 1
+            j += 1
+        elif (category1, title1) < (category2, title2):
+            removed.append(snap1[i])
+            i += 1
+        else:
+            added.append(snap2[j])
+            j += 1
     
-    return snapshot
+    removed.extend(snap1[i:])
+    added.extend(snap2[j:])
+    return added, removed, changed
 
 
-def compare_snapshots(snap1, snap2):
-    """Compare two handle snapshots."""
-    changes = []
+def compare_snapshots(snap1, snap2, fingerprint1=None, fingerprint2=None):
+    """Compare two handle snapshots.
     
-    for category in set(snap1.keys()) | set(snap2.keys()):
-        if category not in snap1:
-            changes.append(f"NEW: {category}")
-            continue
-        elif category not in snap2:
-            changes.append(f"REMOVED: {category}")
-            continue
-        
-        # Compare handles in this category
-        handles1 = {title: handle for title, handle in snap1[category]}
-        handles2 = {title: handle for title, handle in snap2[category]}
-        
-        for title in set(handles1.keys()) | set(handles2.keys()):
-            if title not in handles1:
-                changes.append(f"NEW WINDOW: {title}")
-            elif title not in handles2:
-                changes.append(f"REMOVED WINDOW: {title}")
-            elif handles1[title] != handles2[title]:
-                changes.append(f"CHANGED: {title} ({handles1[title]} -> {handles2[title]})")
+    When both fingerprints are given and match, the snapshots are taken as
+    identical without diffing them.
+    """
+    if fingerprint1 is not None and fingerprint1 == fingerprint2:
+        return []
+    
+    added, removed, changed = diff_flat_snapshots(snap1, snap2)
+    
+    changes = []
+    for _, title, hwnd in removed:
+        changes.append(f"REMOVED WINDOW: {title}")
+    for _, title, hwnd, new_hwnd in changed:
+        changes.append(f"CHANGED: {title} ({hwnd} -> {new_hwnd})")
+    for _, title, hwnd in added:
+        changes.append(f"NEW WINDOW: {title}")
     
     return changes
 
@@ -57,43 +110,63 @@ def monitor_gameplay_stability(duration_minutes=5, check_interval=30):
     
     # Initial snapshot
     print("Taking initial snapshot...")
-    initial_snapshot = capture_handle_snapshot()
+    initial_snapshot, initial_fingerprint = capture_handle_snapshot()
     
     if not initial_snapshot:
         print("ERROR: No Text the Spire windows found!")
         return False
     
-    total_windows = sum(len(windows) for windows in initial_snapshot.values())
-    print(f"Monitoring {total_windows} windows across {len(initial_snapshot)} categories")
+    categories = {category_id for category_id, _, _ in initial_snapshot}
+    print(f"Monitoring {len(initial_snapshot)} windows across {len(categories)} categories")
     print()
     
     start_time = time.time()
     end_time = start_time + (duration_minutes * 60)
     check_count = 1
-    all_stable = True
+    
+    # Diff each check against the previous one so a change is reported once
+    prev_snapshot, prev_fingerprint = initial_snapshot, initial_fingerprint
+    cumulative_changes = []
+    
+    # Re-check only when a game window is created, destroyed or renamed
+    first_hwnd = initial_snapshot[0][2]
+    _, game_pid = win32gui.GetWindowThreadProcessId(first_hwnd)
+    watcher = start_watcher(game_pid)
     
     print("Monitor started. Play the game normally...")
-    print("(The script will check handles periodically)")
+    if watcher:
+        print("(The script will check handles whenever game windows change)")
+    else:
+        print(f"(Window events unavailable, checking handles every {check_interval} seconds)")
     print()
     
     try:
         while time.time() < end_time:
-            time.sleep(check_interval)
+            if watcher:
+                if not watcher.wait(timeout=end_time - time.time()):
+                    break
+            else:
+                time.sleep(check_interval)
             
-            current_time = datetime.now().strftime("%H:%M:%S")
-            current_snapshot = capture_handle_snapshot()
+            current_time = now_hms()
+            current_snapshot, current_fingerprint = capture_handle_snapshot()
             
             if not current_snapshot:
                 print(f"[{current_time}] WARNING: No windows found - game may have closed")
                 continue
             
-            changes = compare_snapshots(initial_snapshot, current_snapshot)
+            changes = compare_snapshots(prev_snapshot, current_snapshot,
+                                        prev_fingerprint, current_fingerprint)
             
             if changes:
-                print(f"[{current_time}] CHECK #{check_count}: CHANGES DETECTED")
+                print(f"[{current_time}] CHECK #{check_count}: CHANGES DETECTED since last check")
                 for change in changes:
                     print(f"  {change}")
-                all_stable = False
+                cumulative_changes.extend(changes)
+                prev_snapshot, prev_fingerprint = current_snapshot, current_fingerprint
+            elif cumulative_changes:
+                print(f"[{current_time}] CHECK #{check_count}: No new changes "
+                      f"({len(cumulative_changes)} earlier)")
             else:
                 print(f"[{current_time}] CHECK #{check_count}: All handles STABLE")
             
@@ -101,10 +174,19 @@ def monitor_gameplay_stability(duration_minutes=5, check_interval=30):
     
     except KeyboardInterrupt:
         print("\nMonitoring stopped by user")
+    finally:
+        if watcher:
+            watcher.stop()
     
     print(f"\nMONITORING COMPLETE")
     print(f"Checks performed: {check_count - 1}")
     
+    all_stable = not cumulative_changes
+    if not all_stable:
+        print(f"Changes detected: {len(cumulative_changes)}")
+        for change in cumulative_changes:
+            print(f"  {change}")
+    
     if all_stable:
         print("✓ RESULT: Handles remained STABLE during gameplay")
         print("  This means handles can be cached during active sessions")
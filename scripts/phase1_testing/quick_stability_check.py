@@ -3,87 +3,88 @@
 Quick stability check - takes a few snapshots to test handle stability.
 """
 
+import queue
+import threading
 import time
-from find_text_spire_windows import find_text_spire_windows
+from monitor_gameplay_handles import capture_handle_snapshot, diff_flat_snapshots
 
 
 def take_snapshot():
-    """Take a snapshot of current handles."""
-    categorized = find_text_spire_windows()
-    
-    handles = {}
-    for category, windows in categorized.items():
-        if windows:
-            handles[category] = [(w['title'], w['hwnd']) for w in windows]
-    
-    return handles
+    """Take a snapshot of current handles as (sorted [(category_id, title, hwnd)], fingerprint)."""
+    return capture_handle_snapshot()
 
 
 def compare_snapshots(snap1, snap2, label1="Snapshot 1", label2="Snapshot 2"):
-    """Compare two snapshots."""
+    """Compare two (snapshot, fingerprint) pairs, diffing only if the fingerprints differ."""
     print(f"\nComparing {label1} vs {label2}:")
     
-    all_same = True
+    (snap1, fingerprint1), (snap2, fingerprint2) = snap1, snap2
+    if fingerprint1 == fingerprint2:
+        print(f"  All handles IDENTICAL")
+        return True
+    
+    added, removed, changed = diff_flat_snapshots(snap1, snap2)
     
-    for category in set(snap1.keys()) | set(snap2.keys()):
-        if category not in snap1 or category not in snap2:
-            print(f"  {category}: Category missing in one snapshot")
-            all_same = False
-            continue
-        
-        handles1 = dict(snap1[category])
-        handles2 = dict(snap2[category])
-        
-        for title in set(handles1.keys()) | set(handles2.keys()):
-            if title not in handles1 or title not in handles2:
-                print(f"  {title}: Window missing in one snapshot")
-                all_same = False
-            elif handles1[title] != handles2[title]:
-                print(f"  {title}: Handle changed ({handles1[title]} -> {handles2[title]})")
-                all_same = False
+    for _, title, _ in removed + added:
+        print(f"  {title}: Window missing in one snapshot")
+    for _, title, hwnd, new_hwnd in changed:
+        print(f"  {title}: Handle changed ({hwnd} -> {new_hwnd})")
     
+    all_same = not (added or removed or changed)
     if all_same:
         print(f"  All handles IDENTICAL")
     
     return all_same
 
 
+def start_sampler(count=3, interval=10):
+    """Take count snapshots interval seconds apart on a background thread.
+    
+    Returns (samples, stop): samples is a queue receiving (timestamp, snapshot)
+    tuples as they are taken, where snapshot is a take_snapshot() result, and
+    setting stop ends sampling early.
+    """
+    samples = queue.Queue()
+    stop = threading.Event()
+    
+    def sampler():
+        for i in range(count):
+            samples.put((time.time(), take_snapshot()))
+            if i < count - 1 and stop.wait(interval):
+                break
+    
+    threading.Thread(target=sampler, daemon=True).start()
+    return samples, stop
+
+
 def main():
     """Take several snapshots to test stability."""
     print("QUICK HANDLE STABILITY CHECK")
     print("Taking 3 snapshots 10 seconds apart...")
     print("=" * 40)
     
-    # Take first snapshot
-    print("Taking snapshot 1...")
-    snap1 = take_snapshot()
+    samples, stop = start_sampler(count=3, interval=10)
+    
+    # First snapshot
+    _, snap1 = samples.get()
+    print("Took snapshot 1")
     
-    if not snap1:
+    if not snap1[0]:
+        stop.set()
         print("ERROR: No Text the Spire windows found!")
         return
     
-    total_windows = sum(len(windows) for windows in snap1.values())
-    print(f"Found {total_windows} windows")
+    print(f"Found {len(snap1[0])} windows")
     
-    # Wait and take second snapshot
+    # Compare each snapshot as soon as it arrives, while the sampler waits for the next one
     print("\nWaiting 10 seconds...")
-    time.sleep(10)
-    
-    print("Taking snapshot 2...")
-    snap2 = take_snapshot()
+    _, snap2 = samples.get()
+    print("Took snapshot 2")
+    stable12 = compare_snapshots(snap1, snap2, "Snapshot 1", "Snapshot 2")
     
-    # Wait and take third snapshot
     print("\nWaiting 10 seconds...")
-    time.sleep(10)
-    
-    print("Taking snapshot 3...")
-    snap3 = take_snapshot()
-    
-    # Compare all snapshots
-    print("\nCOMPARING SNAPSHOTS:")
-    print("=" * 30)
-    
-    stable12 = compare_snapshots(snap1, snap2, "Snapshot 1", "Snapshot 2")
+    _, snap3 = samples.get()
+    print("Took snapshot 3")
     stable23 = compare_snapshots(snap2, snap3, "Snapshot 2", "Snapshot 3")
     stable13 = compare_snapshots(snap1, snap3, "Snapshot 1", "Snapshot 3")
     
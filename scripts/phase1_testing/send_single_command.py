@@ -3,52 +3,34 @@
 Send a single command to verify title change behavior.
 """
 
-import sys
-import os
-import time
-from pywinauto import Application
+from find_text_spire_windows import find_hwnd_by_title
+from reliable_window_finder import get_input_hwnd, post_command
 
-# Add scripts directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '../scripts'))
-
-from reliable_window_finder import TextTheSpireWindowFinder
+def get_prompt_hwnd():
+    """Get the prompt window handle with FindWindow lookups (titled 'Prompt' or 'info')."""
+    for title in ('Prompt', 'info'):
+        hwnd = find_hwnd_by_title(title)
+        if hwnd:
+            return hwnd, title
+    return None, None
 
 def send_info_command():
     """Send the 'info' command to the prompt window."""
-    finder = TextTheSpireWindowFinder()
-    
     # Get prompt window
-    prompt_data = finder.get_prompt_window()
-    if not prompt_data:
+    prompt_hwnd, prompt_title = get_prompt_hwnd()
+    if not prompt_hwnd:
         print("[ERROR] Prompt window not found")
         return False
     
-    print(f"[OK] Found prompt window: '{prompt_data['title']}' (Handle: {prompt_data['hwnd']})")
+    print(f"[OK] Found prompt window: '{prompt_title}' (Handle: {prompt_hwnd})")
     
     try:
-        # Connect with pywinauto
-        app = Application().connect(handle=prompt_data['hwnd'])
-        window = app.window(handle=prompt_data['hwnd'])
-        
-        # Send the info command
-        print("[INFO] Sending 'info' command...")
-        window.set_focus()
-        time.sleep(0.1)
-        
-        # Smart clearing approach that works whether prompt is empty or not:
-        # 1. Type a space (won't trigger error sound even if empty)
-        # 2. Select all (selects space + any existing content)
-        # 3. Type the command (replaces selection)
-        print("[INFO] Using smart clearing approach...")
-        window.type_keys(" ")      # Type space (no error sound)
-        time.sleep(0.05)
-        window.type_keys("^a")     # Select all
-        time.sleep(0.05)
-        window.type_keys("info")   # Type command (replaces selection)
-        time.sleep(0.1)
+        # The prompt has no Edit child, so this is normally the frame itself. It
+        # takes posted WM_CHAR input directly; WM_SETTEXT would only rename it
+        input_hwnd = get_input_hwnd(prompt_hwnd)
         
-        print("[INFO] Executing command...")
-        window.type_keys("{ENTER}")     # Execute
+        print("[INFO] Sending 'info' command and executing it...")
+        post_command(input_hwnd, "info")
         
         print("[OK] Command 'info' sent successfully")
         return True
@@ -7,13 +7,15 @@ Tests detection when game is running vs not running.
 import time
 import sys
 from find_text_spire_windows import find_text_spire_windows, print_categorized_windows
+from monitor_gameplay_handles import now_hms
+from window_events import start_watcher
 
 
-def test_detection_state():
-    """Test and report current window detection state."""
-    print("Testing Text the Spire window detection...")
-    print("=" * 50)
+def detect_state():
+    """Detect the current state without printing anything.
     
+    Returns (state, counts, categorized).
+    """
     categorized = find_text_spire_windows()
     
     # Count windows by category
@@ -25,13 +27,6 @@ def test_detection_state():
         'other': len(categorized['other_spire_windows'])
     }
     
-    total_windows = sum(counts.values())
-    
-    print(f"DETECTION RESULTS:")
-    print(f"Total Text the Spire windows found: {total_windows}")
-    for category, count in counts.items():
-        print(f"  {category.replace('_', ' ').title()}: {count}")
-    
     # Determine game state
     if counts['main_game'] > 0 and counts['game_state'] > 0:
         state = "GAME RUNNING WITH TEXT THE SPIRE MOD"
@@ -42,11 +37,32 @@ def test_detection_state():
     else:
         state = "GAME NOT RUNNING"
     
+    return state, counts, categorized
+
+
+def report_detection_state(state, counts, categorized):
+    """Print the detection results for a detected state."""
+    total_windows = sum(counts.values())
+    
+    print(f"DETECTION RESULTS:")
+    print(f"Total Text the Spire windows found: {total_windows}")
+    for category, count in counts.items():
+        print(f"  {category.replace('_', ' ').title()}: {count}")
+    
     print(f"\nDETECTED STATE: {state}")
     
     if total_windows > 0:
         print(f"\nDETAILED WINDOW INFO:")
         print_categorized_windows(categorized)
+
+
+def test_detection_state():
+    """Test and report current window detection state."""
+    print("Testing Text the Spire window detection...")
+    print("=" * 50)
+    
+    state, counts, categorized = detect_state()
+    report_detection_state(state, counts, categorized)
     
     return state, counts
 
@@ -57,14 +73,35 @@ def main():
         print("Continuous monitoring mode. Press Ctrl+C to stop.")
         print("Start/stop Text the Spire to see detection changes.")
         
+        # Re-test when any top-level window appears, disappears or is renamed
+        watcher = start_watcher()
+        
+        previous = None
+        
         try:
             while True:
-                state, counts = test_detection_state()
-                print(f"\n[{time.strftime('%H:%M:%S')}] Current state: {state}")
-                print("-" * 50)
-                time.sleep(5)
+                state, counts, categorized = detect_state()
+                
+                # Only print the full report when the state or counts changed
+                if (state, counts) != previous:
+                    print()
+                    report_detection_state(state, counts, categorized)
+                    print(f"\n[{now_hms()}] Current state: {state}")
+                    print("-" * 50)
+                    previous = (state, counts)
+                else:
+                    sys.stdout.write(".")
+                    sys.stdout.flush()
+                
+                if watcher:
+                    watcher.wait()
+                else:
+                    time.sleep(5)
         except KeyboardInterrupt:
             print("\nMonitoring stopped.")
+        finally:
+            if watcher:
+                watcher.stop()
     else:
         print("Single detection test:")
         print("Usage: python test_detection_states.py [--continuous]")
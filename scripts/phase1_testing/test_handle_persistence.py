@@ -5,36 +5,126 @@ This script helps determine if window handles remain stable when the game restar
 """
 
 import time
+import glob
+import hashlib
 import json
 import os
+import sys
+from typing import NamedTuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
-from find_text_spire_windows import find_text_spire_windows
+import win32api
+import win32con
+import win32event
+import win32gui
+from find_text_spire_windows import find_known_handles, find_windows_fast
+
+
+class WindowRecord(NamedTuple):
+    """Handle information of one window, as stored in a snapshot file."""
+    title: str
+    handle: int
+    class_name: str
+    size: str
+    process_id: int
+
+
+# Last saved snapshot per session as {session_name: (digest, filepath)}
+_LAST_SAVED = {}
 
 
 def capture_window_handles():
     """Capture current window handles and metadata."""
-    categorized = find_text_spire_windows()
+    categorized = find_windows_fast()
     
     # Extract handle information
     handles_info = {}
     
     for category, windows in categorized.items():
         if windows:
-            handles_info[category] = []
-            for window in windows:
-                handles_info[category].append({
-                    'title': window['title'],
-                    'handle': window['hwnd'],
-                    'class_name': window['class_name'],
-                    'size': f"{window['width']}x{window['height']}",
-                    'process_id': window['process_id']
-                })
+            handles_info[category] = [
+                WindowRecord(window.title, window.hwnd, window.class_name,
+                             f"{window.width}x{window.height}", window.process_id)
+                for window in windows
+            ]
     
     return handles_info
 
 
+def handles_to_json(handles_info):
+    """Convert {category: [WindowRecord]} to plain dicts for JSON."""
+    return {category: [record._asdict() for record in records]
+            for category, records in handles_info.items()}
+
+
+def handles_from_json(handles):
+    """Convert the JSON handles of a snapshot file back to {category: [WindowRecord]}."""
+    return {
+        sys.intern(category): [
+            WindowRecord(w['title'], w['handle'], sys.intern(w['class_name']),
+                         w['size'], w['process_id'])
+            for w in windows
+        ]
+        for category, windows in handles.items()
+    }
+
+
+def handles_digest(handles_info):
+    """Hash of the handles info, independent of key order."""
+    if orjson is not None:
+        data = orjson.dumps(handles_info, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(handles_info, sort_keys=True).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _last_saved_snapshot(session_name):
+    """(digest, filepath) of the newest saved snapshot of a session, or None.
+    
+    Falls back to the newest file on disk so unchanged handles are not
+    written again by a later run either.
+    """
+    if session_name in _LAST_SAVED:
+        return _LAST_SAVED[session_name]
+    
+    pattern = os.path.join(os.path.dirname(__file__), f"handles_{session_name}_*.json")
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        return None
+    
+    with open(paths[-1], 'rb') as f:
+        data = f.read()
+    try:
+        snapshot = orjson.loads(data) if orjson is not None else json.loads(data)
+    except ValueError:
+        return None
+    
+    digest = snapshot.get('digest')
+    if digest is None:
+        # Written before digests were stored
+        return None
+    
+    _LAST_SAVED[session_name] = (digest, paths[-1])
+    return _LAST_SAVED[session_name]
+
+
 def save_handles_snapshot(handles_info, session_name):
-    """Save handles to a JSON file for comparison."""
+    """Save handles to a JSON file for comparison.
+    
+    If the handles are identical to the last snapshot saved for the same
+    session, nothing is written and that snapshot's path is returned.
+    """
+    handles_info = handles_to_json(handles_info)
+    digest = handles_digest(handles_info)
+    last_saved = _last_saved_snapshot(session_name)
+    if last_saved is not None and last_saved[0] == digest:
+        print(f"Handles unchanged, reusing snapshot: {os.path.basename(last_saved[1])}")
+        return last_saved[1]
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"handles_{session_name}_{timestamp}.json"
     filepath = os.path.join(os.path.dirname(__file__), filename)
@@ -42,12 +132,18 @@ def save_handles_snapshot(handles_info, session_name):
     snapshot = {
         'timestamp': timestamp,
         'session_name': session_name,
+        'digest': digest,
         'handles': handles_info
     }
     
-    with open(filepath, 'w') as f:
-        json.dump(snapshot, f, indent=2)
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(snapshot, f, indent=2)
     
+    _LAST_SAVED[session_name] = (digest, filepath)
     print(f"Saved handles snapshot: {filename}")
     return filepath
 
@@ -56,8 +152,11 @@ def compare_handle_snapshots(snapshot1_path, snapshot2_path):
     """Compare two handle snapshots to check for stability."""
     
     def load_snapshot(path):
-        with open(path, 'r') as f:
-            return json.load(f)
+        with open(path, 'rb') as f:
+            data = f.read()
+        snapshot = orjson.loads(data) if orjson is not None else json.loads(data)
+        snapshot['handles'] = handles_from_json(snapshot['handles'])
+        return snapshot
     
     snap1 = load_snapshot(snapshot1_path)
     snap2 = load_snapshot(snapshot2_path)
@@ -93,29 +192,91 @@ def compare_handle_snapshots(snapshot1_path, snapshot2_path):
             all_stable = False
         
         # Match windows by title
+        by_title1 = {w.title: w for w in windows1}
+        by_title2 = {w.title: w for w in windows2}
+        
         for w1 in windows1:
-            matching_w2 = next((w for w in windows2 if w['title'] == w1['title']), None)
+            matching_w2 = by_title2.get(w1.title)
             
             if not matching_w2:
-                print(f"  MISSING WINDOW: '{w1['title']}'")
+                print(f"  MISSING WINDOW: '{w1.title}'")
                 all_stable = False
                 continue
             
             # Compare handles
-            if w1['handle'] == matching_w2['handle']:
-                print(f"  ✓ '{w1['title']}': Handle STABLE ({w1['handle']})")
+            if w1.handle == matching_w2.handle:
+                print(f"  ✓ '{w1.title}': Handle STABLE ({w1.handle})")
             else:
-                print(f"  ✗ '{w1['title']}': Handle CHANGED ({w1['handle']} -> {matching_w2['handle']})")
+                print(f"  ✗ '{w1.title}': Handle CHANGED ({w1.handle} -> {matching_w2.handle})")
                 all_stable = False
             
             # Check other properties
-            if w1['process_id'] != matching_w2['process_id']:
-                print(f"    Process ID changed: {w1['process_id']} -> {matching_w2['process_id']}")
+            if w1.process_id != matching_w2.process_id:
+                print(f"    Process ID changed: {w1.process_id} -> {matching_w2.process_id}")
+        
+        for w2 in windows2:
+            if w2.title not in by_title1:
+                print(f"  NEW WINDOW: '{w2.title}' ({w2.handle})")
+                all_stable = False
     
     print(f"\nOVERALL RESULT: {'HANDLES STABLE' if all_stable else 'HANDLES CHANGED'}")
     return all_stable
 
 
+def open_process(process_id):
+    """Open a process for waiting on it, or return None if it cannot be opened."""
+    try:
+        return win32api.OpenProcess(
+            win32con.SYNCHRONIZE | win32con.PROCESS_QUERY_INFORMATION,
+            False, process_id)
+    except Exception:
+        return None
+
+
+def wait_for_process_exit(process):
+    """Block until a process exits."""
+    # Wait in short slices so Ctrl+C is handled promptly
+    while win32event.WaitForSingleObject(process, 1000) == win32event.WAIT_TIMEOUT:
+        pass
+
+
+def wait_for_game_windows(expected_titles, poll_interval=0.2):
+    """Wait until the main game window and every expected game state window are back, then for the game to go idle.
+    
+    The game state windows are created one by one as a run loads, so this
+    waits for all of expected_titles rather than the first one. Ctrl+C stops
+    waiting and takes the snapshot with whatever windows exist.
+    """
+    handles = {}
+    missing = None
+    try:
+        while True:
+            handles = find_known_handles()
+            if 'main_game_window' in handles:
+                now_missing = set(expected_titles) - set(handles.get('game_state_windows', {}))
+                if not now_missing:
+                    break
+                if now_missing != missing:
+                    missing = now_missing
+                    print(f"  Waiting for: {', '.join(sorted(missing))} (Ctrl+C to continue without them)")
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("[INFO] Not waiting for the remaining windows")
+        if 'main_game_window' not in handles:
+            return
+    
+    main_hwnd = next(iter(handles['main_game_window'].values()))
+    _, process_id = win32gui.GetWindowThreadProcessId(main_hwnd)
+    process = open_process(process_id)
+    if process is not None:
+        try:
+            win32event.WaitForInputIdle(process, 5000)
+        except Exception:
+            pass
+        finally:
+            win32api.CloseHandle(process)
+
+
 def interactive_test():
     """Interactive test for handle persistence."""
     print("TEXT THE SPIRE HANDLE PERSISTENCE TEST")
@@ -149,7 +310,20 @@ def interactive_test():
     print("1. Close Text the Spire completely")
     print("2. Restart Text the Spire with the Text the Spire mod")
     print("3. Load the same save or start a new run")
-    input("Press Enter when the game is running again...")
+    
+    main_windows = handles1.get('main_game_window')
+    process = open_process(main_windows[0].process_id) if main_windows else None
+    if process is None:
+        input("Press Enter when the game is running again...")
+    else:
+        try:
+            print("Waiting for the game to close...")
+            wait_for_process_exit(process)
+        finally:
+            win32api.CloseHandle(process)
+        print("[OK] Game closed. Waiting for it to start again...")
+        wait_for_game_windows([window.title for window in handles1.get('game_state_windows', [])])
+        print("[OK] Game is running again")
     
     # Second snapshot
     handles2 = capture_window_handles()
@@ -5,7 +5,7 @@ Demonstration of handle persistence testing workflow.
 
 import os
 import glob
-from capture_handles import capture_and_save_handles, compare_two_files
+from capture_handles import capture_and_save_handles, compare_two_files, read_wal
 
 
 def demonstrate_workflow():
@@ -29,14 +29,21 @@ def demonstrate_workflow():
     print("2. Restart Text the Spire with the Text the Spire mod")
     print("3. Load the same save or start a new run")
     print("4. Run: python capture_handles.py capture after_restart")
-    print("5. Run: python capture_handles.py compare handles_demo_session1_*.json handles_after_restart_*.json")
+    print("5. Run: python capture_handles.py compare demo_session1 after_restart")
     print()
     
-    # Check if we have previous captures to compare
-    before_files = glob.glob("handles_before_restart_*.json")
-    after_files = glob.glob("handles_after_restart_*.json")
+    # Check if we have previous captures to compare, either in the capture log
+    # or as JSON files from older captures
+    sessions = {record['session'] for record in read_wal()}
+    # File names end in a timestamp, so the newest capture sorts last
+    before_files = sorted(glob.glob("handles_before_restart_*.json"))
+    after_files = sorted(glob.glob("handles_after_restart_*.json"))
     
-    if before_files and after_files:
+    if 'before_restart' in sessions and 'after_restart' in sessions:
+        print("FOUND PREVIOUS CAPTURES - COMPARING:")
+        print("=" * 40)
+        compare_two_files('before_restart', 'after_restart')
+    elif before_files and after_files:
         print("FOUND PREVIOUS CAPTURES - COMPARING:")
         print("=" * 40)
         compare_two_files(before_files[-1], after_files[-1])
@@ -3,12 +3,68 @@
 Test script to verify the 'info' window is the prompt window by attempting to read from it.
 """
 
-import pywinauto
-from pywinauto import Application, findwindows
+import ctypes
+import ctypes.wintypes
+import importlib.util
 import win32gui
 import time
 
 
+WS_VISIBLE = 0x10000000
+
+
+class WINDOWINFO(ctypes.Structure):
+    """Win32 WINDOWINFO structure filled by GetWindowInfo."""
+    _fields_ = [
+        ('cbSize', ctypes.wintypes.DWORD),
+        ('rcWindow', ctypes.wintypes.RECT),
+        ('rcClient', ctypes.wintypes.RECT),
+        ('dwStyle', ctypes.wintypes.DWORD),
+        ('dwExStyle', ctypes.wintypes.DWORD),
+        ('dwWindowStatus', ctypes.wintypes.DWORD),
+        ('cxWindowBorders', ctypes.wintypes.UINT),
+        ('cyWindowBorders', ctypes.wintypes.UINT),
+        ('atomWindowType', ctypes.wintypes.ATOM),
+        ('wCreatorVersion', ctypes.wintypes.WORD),
+    ]
+
+
+def get_window_info(hwnd):
+    """Get rect and style of a window in one GetWindowInfo call, or None if the handle is invalid."""
+    info = WINDOWINFO()
+    info.cbSize = ctypes.sizeof(WINDOWINFO)
+    if not ctypes.windll.user32.GetWindowInfo(hwnd, ctypes.byref(info)):
+        return None
+    return info
+
+
+def get_child_controls(hwnd):
+    """List (hwnd, class_name, text) for every child control in one EnumChildWindows pass."""
+    controls = []
+    
+    def callback(child_hwnd, _):
+        controls.append((child_hwnd,
+                         win32gui.GetClassName(child_hwnd),
+                         win32gui.GetWindowText(child_hwnd)))
+        return True
+    
+    win32gui.EnumChildWindows(hwnd, callback, None)
+    return controls
+
+
+def print_child_controls(hwnd):
+    """Print the text and class of every child control of a window."""
+    try:
+        controls = get_child_controls(hwnd)
+        print(f"Number of child controls: {len(controls)}")
+        
+        for i, (_, control_class, control_text) in enumerate(controls):
+            print(f"  Control {i}: '{control_text}' (Class: {control_class})")
+    
+    except Exception as e:
+        print(f"Could not enumerate controls: {e}")
+
+
 def test_info_window():
     """Test the 'info' window to confirm it's the prompt window."""
     print("TESTING 'info' WINDOW AS PROMPT WINDOW")
@@ -21,19 +77,21 @@ def test_info_window():
     
     # Verify the window still exists and get current info
     try:
-        if win32gui.IsWindow(info_handle):
+        # GetWindowInfo fails for invalid handles and returns rect and style together
+        info = get_window_info(info_handle)
+        if info is not None:
             title = win32gui.GetWindowText(info_handle)
             class_name = win32gui.GetClassName(info_handle)
-            rect = win32gui.GetWindowRect(info_handle)
-            width = rect[2] - rect[0]
-            height = rect[3] - rect[1]
+            rect = info.rcWindow
+            width = rect.right - rect.left
+            height = rect.bottom - rect.top
             
             print(f"Window exists: Yes")
             print(f"Title: '{title}'")
             print(f"Class: {class_name}")
             print(f"Size: {width}x{height}")
-            print(f"Position: ({rect[0]}, {rect[1]})")
-            print(f"Visible: {win32gui.IsWindowVisible(info_handle)}")
+            print(f"Position: ({rect.left}, {rect.top})")
+            print(f"Visible: {bool(info.dwStyle & WS_VISIBLE)}")
         else:
             print("ERROR: Window handle no longer valid")
             return False
@@ -41,12 +99,19 @@ def test_info_window():
         print(f"ERROR: Could not get window info: {e}")
         return False
     
+    # pywinauto is slow to import, so only load it once the window checks out
+    if importlib.util.find_spec('pywinauto') is None:
+        print("\npywinauto not installed, reading child controls directly...")
+        print_child_controls(info_handle)
+        return True
+    
+    from window_reader import get_window
+    
     # Try to connect using pywinauto
     print("\nTesting pywinauto connection...")
     try:
-        # Connect using handle
-        app = Application().connect(handle=info_handle)
-        window = app.window(handle=info_handle)
+        # Connect using handle (reuses the cached connection)
+        window = get_window(info_handle)
         
         print(f"Connected successfully: {window.exists()}")
         print(f"Window is visible: {window.is_visible()}")
@@ -62,21 +127,7 @@ def test_info_window():
         
         # Try to get all text from the window
         print("\nAttempting to read all text content...")
-        try:
-            # Get all control info
-            controls = window.children()
-            print(f"Number of child controls: {len(controls)}")
-            
-            for i, control in enumerate(controls):
-                try:
-                    control_text = control.window_text()
-                    control_class = control.class_name()
-                    print(f"  Control {i}: '{control_text}' (Class: {control_class})")
-                except Exception as e:
-                    print(f"  Control {i}: Error reading - {e}")
-        
-        except Exception as e:
-            print(f"Could not enumerate controls: {e}")
+        print_child_controls(info_handle)
         
         # Try getting the full window content
         print("\nAttempting to capture full window content...")
@@ -5,8 +5,6 @@ Test different methods to check if prompt window has content.
 
 import sys
 import os
-import time
-from pywinauto import Application
 import win32gui
 import win32con
 import win32api
@@ -14,11 +12,58 @@ import win32api
 # Add scripts directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../scripts'))
 
-from reliable_window_finder import TextTheSpireWindowFinder
+from reliable_window_finder import TextTheSpireWindowFinder, get_input_hwnd
+from test_info_window import get_child_controls
 
-def test_prompt_content_methods():
+# Timeout for WM_GETTEXT messages, so a window that is not pumping messages cannot stall the probe
+GETTEXT_TIMEOUT_MS = 100
+
+def get_text_bounded(handle):
+    """Read a window's text in bounded time.
+    
+    Uses GetWindowText first and only falls back to WM_GETTEXT sent with
+    SendMessageTimeout if that returns nothing. Raises if the window does
+    not answer within GETTEXT_TIMEOUT_MS.
+    """
+    text = win32gui.GetWindowText(handle)
+    if text:
+        return text
+    
+    flags = win32con.SMTO_ABORTIFHUNG | win32con.SMTO_BLOCK
+    _, text_length = win32gui.SendMessageTimeout(
+        handle, win32con.WM_GETTEXTLENGTH, 0, 0, flags, GETTEXT_TIMEOUT_MS)
+    print(f"WM_GETTEXTLENGTH: {text_length}")
+    
+    buffer_size = text_length + 1
+    buffer = win32gui.PyMakeBuffer(buffer_size)
+    win32gui.SendMessageTimeout(
+        handle, win32con.WM_GETTEXT, buffer_size, buffer, flags, GETTEXT_TIMEOUT_MS)
+    return buffer[:text_length]
+
+def post_key(handle, vk, modifiers=()):
+    """Post a key press, with modifier keys held, without waiting for the window to process it."""
+    for modifier in modifiers:
+        win32api.PostMessage(handle, win32con.WM_KEYDOWN, modifier, 0)
+    win32api.PostMessage(handle, win32con.WM_KEYDOWN, vk, 0)
+    win32api.PostMessage(handle, win32con.WM_KEYUP, vk, 0)
+    for modifier in reversed(modifiers):
+        win32api.PostMessage(handle, win32con.WM_KEYUP, modifier, 0)
+
+def post_string(handle, text):
+    """Post text as WM_CHAR messages straight to a window; no focus or key translation needed."""
+    for ch in text:
+        win32api.PostMessage(handle, win32con.WM_CHAR, ord(ch), 0)
+
+def press_keys(*vks):
+    """Press a key combination with keybd_event: keys go down in order and up in reverse."""
+    for vk in vks:
+        win32api.keybd_event(vk, 0, 0, 0)
+    for vk in reversed(vks):
+        win32api.keybd_event(vk, 0, win32con.KEYEVENTF_KEYUP, 0)
+
+def test_prompt_content_methods(finder=None):
     """Test various methods to check prompt content."""
-    finder = TextTheSpireWindowFinder()
+    finder = finder or TextTheSpireWindowFinder()
     
     # Get prompt window
     prompt_data = finder.get_prompt_window()
@@ -26,47 +71,37 @@ def test_prompt_content_methods():
         print("[ERROR] Prompt window not found")
         return False
     
-    print(f"[OK] Found prompt window: '{prompt_data['title']}' (Handle: {prompt_data['hwnd']})")
+    print(f"[OK] Found prompt window: '{prompt_data.title}' (Handle: {prompt_data.hwnd})")
     
     try:
-        # Connect with pywinauto
-        app = Application().connect(handle=prompt_data['hwnd'])
-        window = app.window(handle=prompt_data['hwnd'])
+        handle = prompt_data.hwnd
         
         print("\n=== METHOD 1: Check window_text() ===")
-        print(f"window_text(): '{window.window_text()}'")
+        print(f"window_text(): '{win32gui.GetWindowText(handle)}'")
         print("[RESULT] Returns window title, not content")
         
         print("\n=== METHOD 2: Check children for edit controls ===")
-        children = window.children()
+        children = get_child_controls(handle)
         print(f"Number of children: {len(children)}")
-        for i, child in enumerate(children):
-            try:
-                print(f"Child {i}: class='{child.class_name()}', text='{child.window_text()}'")
-                # Try to get text from edit control
-                if 'edit' in child.class_name().lower():
-                    print(f"  Found edit control! Trying to get content...")
-                    # Try different methods
-                    try:
-                        texts = child.texts()
-                        print(f"  texts(): {texts}")
-                    except:
-                        print(f"  texts() failed")
-            except Exception as e:
-                print(f"Child {i}: Error - {e}")
+        for i, (_, class_name, text) in enumerate(children):
+            print(f"Child {i}: class='{class_name}', text='{text}'")
+            if 'edit' in class_name.lower():
+                print(f"  Found edit control!")
         
         print("\n=== METHOD 3: Try to get selected text ===")
-        window.set_focus()
-        time.sleep(0.1)
+        win32gui.SetForegroundWindow(handle)
+        finder.wait_for_input_idle(prompt_data)
         # Select all
-        window.type_keys("^a")
-        time.sleep(0.1)
+        press_keys(win32con.VK_CONTROL, ord('A'))
+        finder.wait_for_input_idle(prompt_data)
         # Try to copy (this might not work)
-        window.type_keys("^c")
-        time.sleep(0.1)
+        press_keys(win32con.VK_CONTROL, ord('C'))
+        finder.wait_for_input_idle(prompt_data)
         print("[INFO] Attempted to select all and copy")
         
         print("\n=== METHOD 4: Use Edit control methods ===")
+        # These are pywinauto wrapper methods, so only this method connects with it
+        window = finder.get_prompt_controller()
         try:
             # Try to treat window as edit control
             edit_text = window.get_value()
@@ -82,33 +117,24 @@ def test_prompt_content_methods():
             print(f"text_block() failed: {e}")
         
         print("\n=== METHOD 5: Send test characters and check response ===")
+        input_hwnd = get_input_hwnd(handle)
         print("[INFO] Typing 'test' into prompt...")
-        window.type_keys("test")
-        time.sleep(0.1)
+        post_string(input_hwnd, "test")
+        finder.wait_for_input_idle(prompt_data)
         
-        # Now try to check if we can detect the content
+        # Select all and delete with posted keys; nothing here needs a reply
         print("[INFO] Selecting all...")
-        window.type_keys("^a")
-        time.sleep(0.1)
+        post_key(input_hwnd, ord('A'), modifiers=(win32con.VK_CONTROL,))
         
         # Clear it
         print("[INFO] Deleting selected text...")
-        window.type_keys("{DELETE}")
-        time.sleep(0.1)
+        post_key(input_hwnd, win32con.VK_DELETE)
+        finder.wait_for_input_idle(prompt_data)
         
         print("\n=== METHOD 6: Use Windows API to get text ===")
-        handle = prompt_data['hwnd']
         try:
-            # Get text length
-            text_length = win32gui.SendMessage(handle, win32con.WM_GETTEXTLENGTH, 0, 0)
-            print(f"WM_GETTEXTLENGTH: {text_length}")
-            
-            # Get actual text
-            buffer_size = text_length + 1
-            buffer = win32gui.PyMakeBuffer(buffer_size)
-            win32gui.SendMessage(handle, win32con.WM_GETTEXT, buffer_size, buffer)
-            text = buffer[:text_length]
-            print(f"WM_GETTEXT: '{text}'")
+            text = get_text_bounded(handle)
+            print(f"Window text: '{text}'")
         except Exception as e:
             print(f"Windows API method failed: {e}")
         
@@ -118,9 +144,9 @@ def test_prompt_content_methods():
         print(f"[ERROR] Testing failed: {e}")
         return False
 
-def test_smart_clearing():
-    """Test a smart clearing approach."""
-    finder = TextTheSpireWindowFinder()
+def test_smart_clearing(finder=None):
+    """Test a smart clearing approach with posted key messages."""
+    finder = finder or TextTheSpireWindowFinder()
     
     prompt_data = finder.get_prompt_window()
     if not prompt_data:
@@ -128,34 +154,25 @@ def test_smart_clearing():
         return False
     
     try:
-        app = Application().connect(handle=prompt_data['hwnd'])
-        window = app.window(handle=prompt_data['hwnd'])
-        
         print("\n=== SMART CLEARING APPROACH ===")
-        window.set_focus()
-        time.sleep(0.1)
+        # The prompt has no child controls, so WM_SETTEXT would rename the
+        # window instead of replacing its text; post keys and characters instead
+        input_hwnd = get_input_hwnd(prompt_data.hwnd)
         
-        # Method 1: Try select all and type - if empty, first char gets selected
+        # Type a test character, select all (the X plus any existing content)
+        # and delete everything. Posted messages are handled in order
         print("[INFO] Attempting smart clear...")
-        
-        # Type a test character
-        window.type_keys("X")
-        time.sleep(0.05)
-        
-        # Select all (will select X plus any existing content)  
-        window.type_keys("^a")
-        time.sleep(0.05)
-        
-        # Delete everything
-        window.type_keys("{DELETE}")
-        time.sleep(0.1)
+        post_string(input_hwnd, "X")
+        post_key(input_hwnd, ord('A'), modifiers=(win32con.VK_CONTROL,))
+        post_key(input_hwnd, win32con.VK_DELETE)
+        finder.wait_for_input_idle(prompt_data)
         
         print("[INFO] Smart clear complete - should work whether empty or not")
         
         # Now type the actual command
         print("[INFO] Typing 'info' command...")
-        window.type_keys("info")
-        time.sleep(0.1)
+        post_string(input_hwnd, "info")
+        finder.wait_for_input_idle(prompt_data)
         
         return True
         
@@ -167,10 +184,13 @@ if __name__ == "__main__":
     print("TESTING PROMPT CONTENT DETECTION METHODS")
     print("=" * 60)
     
+    # Share one finder so the prompt lookup and connection are reused
+    finder = TextTheSpireWindowFinder()
+    
     # Test various methods
-    test_prompt_content_methods()
+    test_prompt_content_methods(finder)
     
     # Test smart clearing
-    test_smart_clearing()
+    test_smart_clearing(finder)
     
     print("\n[DONE] Testing complete")
\ No newline at end of file
@@ -4,9 +4,107 @@ Reliable window finder for Text the Spire windows.
 Based on handle persistence testing findings.
 """
 
+import ctypes
+import ctypes.wintypes
+import win32api
+import win32con
+import win32event
 import win32gui
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import time
+from find_text_spire_windows import CATEGORIES, Window, find_window, window_category
+from window_events import start_watcher
+
+
+try:
+    # EnumWindows callback type for calling user32 directly instead of through pywin32
+    EnumWindowsProc = ctypes.WINFUNCTYPE(
+        ctypes.wintypes.BOOL, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM)
+except AttributeError:
+    # Not on Windows
+    EnumWindowsProc = None
+
+
+# Window classes whose creation or destruction invalidates the finder's cache
+_WATCHED_CLASSES = frozenset({'LWJGL', 'SunAwtFrame', 'SWT_Window0'})
+
+
+def get_input_hwnd(prompt_hwnd: int) -> int:
+    """Get the control that takes text input: an Edit child if there is one, else the prompt itself."""
+    try:
+        edit_hwnd = win32gui.FindWindowEx(prompt_hwnd, 0, "Edit", None)
+    except Exception:
+        # pywin32 raises when there is no such child
+        edit_hwnd = 0
+    return edit_hwnd or prompt_hwnd
+
+
+def post_command(hwnd: int, command: str) -> None:
+    """Type a command into the prompt and submit it, using posted messages only.
+    
+    Each character goes as WM_CHAR and Enter as WM_KEYDOWN/WM_KEYUP, the
+    working WinAPI method from docs/command_input_findings.md. Posted
+    messages keep their queue order, so commands can be queued back to back.
+    The text is added to whatever the prompt already holds.
+    """
+    for char in command:
+        win32api.PostMessage(hwnd, win32con.WM_CHAR, ord(char), 0)
+    win32api.PostMessage(hwnd, win32con.WM_KEYDOWN, win32con.VK_RETURN, 0)
+    win32api.PostMessage(hwnd, win32con.WM_KEYUP, win32con.VK_RETURN, 0)
+
+
+class LazyWindow:
+    """Window record with the same attributes as Window, but the rect is only read on first use.
+    
+    Most callers only need hwnd and title, so enumeration skips
+    GetWindowRect for windows whose geometry is never looked at.
+    """
+    
+    __slots__ = ('hwnd', 'title', 'class_name', 'process_id', '_rect')
+    
+    def __init__(self, hwnd: int, title: str, class_name: str, process_id: int):
+        self.hwnd = hwnd
+        self.title = title
+        self.class_name = class_name
+        self.process_id = process_id
+        self._rect = None
+    
+    def _get_rect(self) -> Tuple[int, int, int, int]:
+        """Window rect as (left, top, right, bottom), read once."""
+        if self._rect is None:
+            try:
+                self._rect = win32gui.GetWindowRect(self.hwnd)
+            except Exception:
+                self._rect = (0, 0, 0, 0)
+        return self._rect
+    
+    @property
+    def x(self) -> int:
+        return self._get_rect()[0]
+    
+    @property
+    def y(self) -> int:
+        return self._get_rect()[1]
+    
+    @property
+    def width(self) -> int:
+        rect = self._get_rect()
+        return rect[2] - rect[0]
+    
+    @property
+    def height(self) -> int:
+        rect = self._get_rect()
+        return rect[3] - rect[1]
+    
+    def with_title(self, title: str) -> 'LazyWindow':
+        """Copy of this record with a new title, keeping an already read rect."""
+        window = LazyWindow(self.hwnd, title, self.class_name, self.process_id)
+        window._rect = self._rect
+        return window
+    
+    def __repr__(self) -> str:
+        return (f"LazyWindow(hwnd={self.hwnd}, title={self.title!r}, "
+                f"class_name={self.class_name!r}, process_id={self.process_id})")
 
 
 class TextTheSpireWindowFinder:
@@ -14,81 +112,103 @@ class TextTheSpireWindowFinder:
     
     def __init__(self):
         self._cached_handles = {}
+        # First cached window of each title, rebuilt whenever the cache is replaced
+        self._title_index: Dict[str, LazyWindow] = {}
         self._cache_timestamp = 0
         self._cache_duration = 30  # Cache valid for 30 seconds during gameplay
+        self._fresh_ttl = 0.5  # Results this recent count as fresh for is_game_running
+        # Class name of each window seen in the last pass: {(hwnd, process_id): class_name}.
+        # Handles can be reused, so the process id is part of the key.
+        self._class_name_cache: Dict[Tuple[int, int], str] = {}
+        # Open process handles for waiting on input processing: {process_id: handle}
+        self._process_handles = {}
+        # Window event watcher, set by start_event_invalidation
+        self._watcher = None
+        # (hwnd, pywinauto window) of the prompt, created on first use
+        self._prompt_controller = None
     
-    def _enum_windows_callback(self, hwnd: int, windows: List[Dict]) -> bool:
+    def _enum_windows_callback(self, hwnd: int, windows: List[LazyWindow]) -> bool:
         """Callback for window enumeration."""
         try:
             if win32gui.IsWindowVisible(hwnd):
+                # The title can change, so it is read on every pass; the rect is read on demand
                 title = win32gui.GetWindowText(hwnd)
-                class_name = win32gui.GetClassName(hwnd)
-                rect = win32gui.GetWindowRect(hwnd)
-                width = rect[2] - rect[0]
-                height = rect[3] - rect[1]
                 _, process_id = win32gui.GetWindowThreadProcessId(hwnd)
                 
-                windows.append({
-                    'hwnd': hwnd,
-                    'title': title,
-                    'class_name': class_name,
-                    'width': width,
-                    'height': height,
-                    'process_id': process_id
-                })
+                class_name = self._class_name_cache.get((hwnd, process_id))
+                if class_name is None:
+                    class_name = win32gui.GetClassName(hwnd)
+                    self._class_name_cache[(hwnd, process_id)] = class_name
+                
+                windows.append(LazyWindow(hwnd, title, class_name, process_id))
         except Exception as e:
             print(f"   Debug: Error processing window {hwnd}: {e}")
         
         return True
     
-    def _enumerate_all_windows(self) -> List[Dict]:
-        """Enumerate all visible windows."""
-        # Use the working implementation from find_text_spire_windows
-        from find_text_spire_windows import find_text_spire_windows
-        
-        # Get all windows using the working function
-        categorized = find_text_spire_windows()
-        
-        # Flatten back to a list
+    def _enumerate_windows(self) -> Dict[str, List[LazyWindow]]:
+        """Enumerate visible windows and categorize them in a single EnumWindows pass."""
         windows = []
-        for window_list in categorized.values():
-            windows.extend(window_list)
+        if EnumWindowsProc is not None:
+            callback = EnumWindowsProc(lambda hwnd, _: self._enum_windows_callback(hwnd, windows))
+            ctypes.windll.user32.EnumWindows(callback, 0)
+        else:
+            win32gui.EnumWindows(self._enum_windows_callback, windows)
         
-        return windows
+        # Drop windows that are gone, so a reused handle is looked up again
+        seen = {(window.hwnd, window.process_id) for window in windows}
+        self._class_name_cache = {key: class_name for key, class_name in self._class_name_cache.items()
+                                  if key in seen}
+        return self._categorize_windows(windows)
     
-    def _categorize_windows(self, windows: List[Dict]) -> Dict[str, List[Dict]]:
+    def _categorize_windows(self, windows: List[LazyWindow]) -> Dict[str, List[LazyWindow]]:
         """Categorize Text the Spire windows."""
-        categorized = {
-            'game_state_windows': [],
-            'prompt_window': [],
-            'main_game_window': [],
-            'mod_launcher': [],
-            'other_spire_windows': []
-        }
-        
-        game_state_titles = {
-            'Player', 'Monster', 'Hand', 'Deck', 'Discard',
-            'Orbs', 'Relic', 'Output', 'Log'
-        }
+        categorized = {category: [] for category in CATEGORIES}
         
+        # One class lookup plus title checks per window, see window_category
         for window in windows:
-            title = window['title']
-            class_name = window['class_name']
-            
-            if 'Slay the Spire' in title and class_name == 'LWJGL':
-                categorized['main_game_window'].append(window)
-            elif (title in ['Prompt', 'info']) and class_name == 'SunAwtFrame':
-                categorized['prompt_window'].append(window)
-            elif 'ModTheSpire' in title:
-                categorized['mod_launcher'].append(window)
-            elif title in game_state_titles and class_name == 'SWT_Window0':
-                categorized['game_state_windows'].append(window)
-            elif any(keyword in title.lower() for keyword in ['spire', 'text']):
-                categorized['other_spire_windows'].append(window)
+            category = window_category(window.class_name, window.title)
+            if category is not None:
+                categorized[category].append(window)
         
         return categorized
     
-    def find_windows(self, use_cache: bool = True) -> Dict[str, List[Dict]]:
+    def _cache_is_fresh(self, current_time: float) -> bool:
+        """Check whether cached handles exist and are recent enough to use."""
+        return bool(self._cached_handles) and \
+            current_time - self._cache_timestamp < self._cache_duration
+    
+    def _revalidate_cache(self) -> Optional[Dict[str, List[LazyWindow]]]:
+        """Re-check the cached windows by handle instead of enumerating again.
+        
+        Returns the cached windows with refreshed titles if every handle is
+        still a visible window in the same category, otherwise None.
+        """
+        revalidated = {}
+        for category, windows in self._cached_handles.items():
+            revalidated[category] = []
+            for window in windows:
+                if not (win32gui.IsWindow(window.hwnd) and win32gui.IsWindowVisible(window.hwnd)):
+                    return None
+                title = win32gui.GetWindowText(window.hwnd)
+                if title != window.title:
+                    if window_category(window.class_name, title) != category:
+                        return None
+                    window = window.with_title(title)
+                revalidated[category].append(window)
+        
+        return revalidated
+    
+    def _set_cache(self, categorized: Dict[str, List[LazyWindow]], timestamp: float) -> None:
+        """Store categorized windows as the cache and index them by title."""
+        self._cached_handles = categorized
+        self._cache_timestamp = timestamp
+        self._title_index = {}
+        for windows in categorized.values():
+            for window in windows:
+                self._title_index.setdefault(window.title, window)
+    
+    def find_windows(self, use_cache: bool = True) -> Dict[str, List[LazyWindow]]:
         """
         Find Text the Spire windows with optional caching.
         
@@ -100,87 +220,218 @@ class TextTheSpireWindowFinder:
         """
         current_time = time.time()
         
+        # With window events, the cache is dropped as soon as a Text the Spire
+        # window changes. The TTL and handle revalidation below still apply, in
+        # case an event was missed
+        if use_cache and self._watcher is not None and self._watcher.poll():
+            self.invalidate_cache()
+        
         # Use cache if available and recent (handles stable during gameplay)
-        if (use_cache and 
-            self._cached_handles and 
-            current_time - self._cache_timestamp < self._cache_duration):
+        if use_cache and self._cache_is_fresh(current_time):
             return self._cached_handles
         
-        # Use the working implementation
-        from find_text_spire_windows import find_text_spire_windows
-        categorized = find_text_spire_windows()
+        # Stale cache: handles are stable during gameplay, so check them directly
+        if use_cache and self._cached_handles:
+            revalidated = self._revalidate_cache()
+            if revalidated is not None:
+                self._set_cache(revalidated, current_time)
+                return revalidated
+        
+        categorized = self._enumerate_windows()
         
         # Cache the results
-        self._cached_handles = categorized
-        self._cache_timestamp = current_time
+        self._set_cache(categorized, current_time)
         
         return categorized
     
-    def get_game_state_windows(self, use_cache: bool = True) -> List[Dict]:
+    def get_game_state_windows(self, use_cache: bool = True) -> List[LazyWindow]:
         """Get all game state windows."""
         windows = self.find_windows(use_cache)
         return windows.get('game_state_windows', [])
     
-    def get_prompt_window(self, use_cache: bool = True) -> Optional[Dict]:
+    def get_prompt_window(self, use_cache: bool = True) -> Optional[LazyWindow]:
         """Get the prompt window for command input."""
         windows = self.find_windows(use_cache)
         prompt_windows = windows.get('prompt_window', [])
         return prompt_windows[0] if prompt_windows else None
     
-    def get_main_game_window(self, use_cache: bool = True) -> Optional[Dict]:
+    def get_main_game_window(self, use_cache: bool = True) -> Optional[LazyWindow]:
         """Get the main game window."""
         windows = self.find_windows(use_cache)
         main_windows = windows.get('main_game_window', [])
         return main_windows[0] if main_windows else None
     
-    def get_window_by_title(self, title: str, use_cache: bool = True) -> Optional[Dict]:
+    def get_window_by_title(self, title: str, use_cache: bool = True) -> Optional[Union[Window, LazyWindow]]:
         """Find a specific window by title."""
-        windows = self.find_windows(use_cache)
+        if not (use_cache and self._cache_is_fresh(time.time())):
+            # A single FindWindow lookup is cheaper than a full enumeration
+            window = find_window(title)
+            if window is not None:
+                return window
         
-        for category_windows in windows.values():
-            for window in category_windows:
-                if window['title'] == title:
-                    return window
-        
-        return None
+        self.find_windows(use_cache)
+        return self._title_index.get(title)
     
-    def is_game_running(self) -> bool:
-        """Check if Text the Spire is running with the mod."""
-        windows = self.find_windows(use_cache=False)  # Always check fresh
+    @staticmethod
+    def _game_running_in(windows: Dict[str, List[LazyWindow]]) -> bool:
+        """Check categorized windows for the main game window and game state windows."""
+        return bool(windows.get('main_game_window')) and bool(windows.get('game_state_windows'))
+    
+    def _find_fresh_windows(self) -> Dict[str, List[LazyWindow]]:
+        """Find windows fresh, reusing a result from the last _fresh_ttl seconds."""
+        use_cache = time.time() - self._cache_timestamp < self._fresh_ttl
+        return self.find_windows(use_cache=use_cache)
+    
+    def _quick_game_running(self) -> bool:
+        """Check for a main game window and a game state window, stopping EnumWindows once both are seen."""
+        found = set()
         
-        has_main_game = len(windows.get('main_game_window', [])) > 0
-        has_game_state = len(windows.get('game_state_windows', [])) > 0
+        def callback(hwnd: int, _) -> bool:
+            try:
+                if not win32gui.IsWindowVisible(hwnd):
+                    return True
+                class_name = win32gui.GetClassName(hwnd)
+                if class_name not in ('LWJGL', 'SWT_Window0'):
+                    return True
+                category = window_category(class_name, win32gui.GetWindowText(hwnd))
+            except Exception:
+                return True
+            
+            if category in ('main_game_window', 'game_state_windows'):
+                found.add(category)
+            return len(found) < 2
         
+        if EnumWindowsProc is not None:
+            ctypes.windll.user32.EnumWindows(EnumWindowsProc(callback), 0)
+        else:
+            try:
+                win32gui.EnumWindows(callback, None)
+            except Exception:
+                # Stopping EnumWindows early from the callback is reported as an error
+                pass
         
-        return has_main_game and has_game_state
+        return len(found) == 2
+    
+    def is_game_running(self) -> bool:
+        """Check if Text the Spire is running with the mod."""
+        if time.time() - self._cache_timestamp < self._fresh_ttl:
+            return self._game_running_in(self._cached_handles)
+        return self._quick_game_running()
     
     def get_game_state_summary(self) -> Dict:
         """Get a summary of the current game state."""
-        windows = self.find_windows()
+        # One fresh enumeration serves both the running check and the counts
+        windows = self._find_fresh_windows()
         
         summary = {
-            'game_running': self.is_game_running(),
+            'game_running': self._game_running_in(windows),
             'window_counts': {
                 category: len(window_list)
                 for category, window_list in windows.items()
             },
             'total_windows': sum(len(w) for w in windows.values()),
             'available_game_states': [
-                w['title'] for w in windows.get('game_state_windows', [])
+                w.title for w in windows.get('game_state_windows', [])
             ]
         }
         
         return summary
     
+    def _get_process_handle(self, process_id: int):
+        """Open a process for waiting, once per process id. None if it cannot be opened."""
+        if process_id not in self._process_handles:
+            try:
+                self._process_handles[process_id] = win32api.OpenProcess(
+                    win32con.PROCESS_QUERY_INFORMATION | win32con.SYNCHRONIZE,
+                    False, process_id)
+            except Exception:
+                self._process_handles[process_id] = None
+        return self._process_handles[process_id]
+    
+    def wait_for_input_idle(self, window: Window, timeout_ms: int = 100) -> None:
+        """Wait until the window's process has processed its pending input.
+        
+        Returns as soon as the process is idle instead of sleeping a fixed
+        time. If the process cannot be waited on, this waits up to
+        timeout_ms, waking early on new input messages.
+        """
+        process = self._get_process_handle(window.process_id)
+        if process is not None:
+            try:
+                win32event.WaitForInputIdle(process, timeout_ms)
+                return
+            except Exception:
+                pass
+        
+        win32event.MsgWaitForMultipleObjects([], False, timeout_ms, win32event.QS_ALLINPUT)
+    
+    def get_prompt_controller(self, use_cache: bool = True):
+        """Get a pywinauto window wrapper for the prompt, or None if it is not found.
+        
+        The wrapper is created once and reused while the prompt keeps its handle.
+        """
+        prompt = self.get_prompt_window(use_cache)
+        if prompt is None:
+            return None
+        
+        if self._prompt_controller is None or self._prompt_controller[0] != prompt.hwnd:
+            # pywinauto is slow to import, so only load it when a controller is needed
+            from window_reader import get_window
+            self._prompt_controller = (prompt.hwnd, get_window(prompt.hwnd))
+        return self._prompt_controller[1]
+    
+    def send_commands(self, commands: List[str]) -> bool:
+        """Send several commands to the prompt back to back.
+        
+        The prompt is looked up once and every command is queued with
+        post_command, without sleeping in between. WM_SETTEXT is not used:
+        the prompt has no child controls, so it would rename the prompt
+        window instead of typing. Returns False if the prompt window is not
+        found.
+        """
+        prompt = self.get_prompt_window()
+        if prompt is None:
+            return False
+        
+        input_hwnd = get_input_hwnd(prompt.hwnd)
+        for command in commands:
+            post_command(input_hwnd, command)
+        
+        # Let the game drain the batch before returning
+        self.wait_for_input_idle(prompt)
+        return True
+    
+    def start_event_invalidation(self) -> bool:
+        """Also invalidate the cache on window events, not only after the 30s TTL.
+        
+        Returns False if window events are unavailable; only the TTL then applies.
+        """
+        if self._watcher is None:
+            self._watcher = start_watcher(class_names=_WATCHED_CLASSES)
+        return self._watcher is not None
+    
+    def stop_event_invalidation(self) -> None:
+        """Stop watching window events and rely on the TTL alone."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+    
     def invalidate_cache(self):
         """Force cache invalidation (call after game restart)."""
         self._cached_handles = {}
+        self._title_index = {}
         self._cache_timestamp = 0
+        self._class_name_cache.clear()
+        for process in self._process_handles.values():
+            if process is not None:
+                win32api.CloseHandle(process)
+        self._process_handles.clear()
+        self._prompt_controller = None
     
     def get_handles_for_category(self, category: str, use_cache: bool = True) -> List[int]:
         """Get just the window handles for a specific category."""
         windows = self.find_windows(use_cache)
-        return [w['hwnd'] for w in windows.get(category, [])]
+        return [w.hwnd for w in windows.get(category, [])]
 
 
 def main():
@@ -209,13 +460,13 @@ def main():
     
     prompt = finder.get_prompt_window()
     if prompt:
-        print(f"   Prompt window: Found (handle {prompt['hwnd']})")
+        print(f"   Prompt window: Found (handle {prompt.hwnd})")
     else:
         print("   Prompt window: Not found")
     
     player_window = finder.get_window_by_title('Player')
     if player_window:
-        print(f"   Player window: Found (handle {player_window['hwnd']})")
+        print(f"   Player window: Found (handle {player_window.hwnd})")
     else:
         print("   Player window: Not found")
     
@@ -8,40 +8,269 @@ Tests rapid command sequences, buffering, latency, and error handling.
 
 import sys
 import os
+import ctypes
+import math
+import queue
+import threading
 import time
 import statistics
-from pywinauto import Application
+from collections import deque
 from datetime import datetime
 
 # Add scripts directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../scripts'))
 
 from reliable_window_finder import TextTheSpireWindowFinder
+from window_reader import get_window, get_child_hwnds, forget_child_hwnds, control_text
+
+# Target log polling period (seconds)
+LOG_POLL_INTERVAL = 0.01
+
+# Latency samples taken per command in test 5.2.3
+LATENCY_MEASUREMENTS = 5
+
+CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+TIMER_ALL_ACCESS = 0x1F0003
+INFINITE = 0xFFFFFFFF
+
+def _create_hr_timer():
+    """Create a high resolution waitable timer, or None if unsupported (not Windows, or before Windows 10 1803)."""
+    try:
+        kernel32 = ctypes.windll.kernel32
+    except AttributeError:
+        return None
+    kernel32.CreateWaitableTimerExW.restype = ctypes.c_void_p
+    handle = kernel32.CreateWaitableTimerExW(None, None, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, TIMER_ALL_ACCESS)
+    return handle or None
+
+_HR_TIMER = _create_hr_timer()
+
+def _hr_sleep(dt):
+    """Sleep dt seconds on the high resolution timer, falling back to time.sleep."""
+    if _HR_TIMER is None:
+        time.sleep(dt)
+        return
+    
+    # Negative due time is relative, in 100ns units
+    due = ctypes.c_longlong(-int(dt * 1e7))
+    kernel32 = ctypes.windll.kernel32
+    if kernel32.SetWaitableTimer(ctypes.c_void_p(_HR_TIMER), ctypes.byref(due), 0, None, None, False):
+        kernel32.WaitForSingleObject(ctypes.c_void_p(_HR_TIMER), INFINITE)
+    else:
+        time.sleep(dt)
+
+class LogWatcher(threading.Thread):
+    """Reads the Log window on its own thread and queues (perf_counter_ns, text) snapshots.
+    
+    Reads the log's child controls directly with WM_GETTEXT, so the timing
+    loop only waits on the queue. Holds at most 8 snapshots; the oldest is
+    dropped when the reader gets ahead.
+    """
+    
+    def __init__(self, hwnd, interval=LOG_POLL_INTERVAL):
+        super().__init__(daemon=True)
+        self.hwnd = hwnd
+        self.interval_ns = int(interval * 1e9)
+        self.queue = queue.Queue(maxsize=8)
+        self._stopped = threading.Event()
+    
+    def stop(self):
+        """Ask the reader loop to exit and wait for it."""
+        self._stopped.set()
+        self.join(timeout=1.0)
+    
+    def _push(self, snapshot):
+        """Queue a snapshot, dropping the oldest one if the queue is full."""
+        while True:
+            try:
+                self.queue.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def run(self):
+        next_read_ns = time.perf_counter_ns()
+        
+        while not self._stopped.is_set():
+            try:
+                read_ns = time.perf_counter_ns()
+                text = '\n'.join(control_text(child_hwnd) for child_hwnd in get_child_hwnds(self.hwnd))
+                self._push((read_ns, text))
+            except Exception:
+                forget_child_hwnds(self.hwnd)
+            
+            next_read_ns += self.interval_ns
+            remaining_ns = next_read_ns - time.perf_counter_ns()
+            if remaining_ns > 0:
+                _hr_sleep(remaining_ns / 1e9)
+
+THREAD_PRIORITY_HIGHEST = 2
+# Core the measuring thread is pinned to
+MEASUREMENT_CPU_MASK = 0x2
+
+def _pin_measurement_thread():
+    """Raise the calling thread's priority and pin it to one core.
+    
+    This cuts scheduler jitter in the measurements, so it narrows the stdev
+    columns of the report rather than moving the means. Returns the previous
+    (priority, affinity mask) for _unpin_measurement_thread, or None if not
+    on Windows.
+    """
+    try:
+        kernel32 = ctypes.windll.kernel32
+    except AttributeError:
+        return None
+    kernel32.GetCurrentThread.restype = ctypes.c_void_p
+    kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+    kernel32.SetThreadAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    
+    thread = ctypes.c_void_p(kernel32.GetCurrentThread())
+    previous_priority = kernel32.GetThreadPriority(thread)
+    kernel32.SetThreadPriority(thread, THREAD_PRIORITY_HIGHEST)
+    # Returns 0 (and changes nothing) on single core machines
+    previous_mask = kernel32.SetThreadAffinityMask(thread, MEASUREMENT_CPU_MASK)
+    return previous_priority, previous_mask
+
+def _unpin_measurement_thread(saved):
+    """Restore the priority and affinity saved by _pin_measurement_thread; call from the same thread."""
+    if saved is None:
+        return
+    previous_priority, previous_mask = saved
+    kernel32 = ctypes.windll.kernel32
+    thread = ctypes.c_void_p(kernel32.GetCurrentThread())
+    kernel32.SetThreadPriority(thread, previous_priority)
+    if previous_mask:
+        kernel32.SetThreadAffinityMask(thread, previous_mask)
+
+class RunningStats:
+    """Running count, mean, sample stdev and max, updated per sample (Welford) without keeping the samples."""
+    
+    __slots__ = ('n', 'mean', 'm2', 'max')
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = 0.0
+    
+    def update(self, x):
+        """Add one sample."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x > self.max:
+            self.max = x
+    
+    @property
+    def stdev(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+class ProgressPrinter(threading.Thread):
+    """Prints progress lines on its own thread so measurement loops never wait on stdout.
+    
+    Lines are dropped rather than blocking when more than 64 are waiting.
+    """
+    
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.queue = queue.Queue(maxsize=64)
+    
+    def post(self, line):
+        """Queue a line for printing without blocking."""
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            pass
+    
+    def flush(self):
+        """Wait until every queued line has been printed."""
+        self.queue.join()
+    
+    def run(self):
+        while True:
+            line = self.queue.get()
+            print(line)
+            self.queue.task_done()
 
 class ReliabilityTester:
     def __init__(self):
         self.finder = TextTheSpireWindowFinder()
+        # Measurement loops post progress here and defer detail lines to _log
+        self._progress = ProgressPrinter()
+        self._progress.start()
+        self._log = []
+        self._saved_thread_state = _pin_measurement_thread()
+        self.log_watcher = None
+        # (hwnd, pywinauto window) kept between commands so the prompt is only connected once
+        self._prompt_win = None
+        # Window handles resolved once; only looked up again after a failure
+        self._prompt_hwnd = None
+        self._log_hwnd = None
+        self._revalidate_handles()
         self.results = {
             'rapid_sequences': [],
             'latency_measurements': [],
             'buffering_tests': [],
-            'error_handling': []
+            'error_handling': [],
+            'poll_periods': RunningStats()
         }
     
+    def _revalidate_handles(self):
+        """Look up the prompt and log window handles again, e.g. after the prompt title changed."""
+        self.finder.invalidate_cache()
+        prompt_window = self.finder.get_prompt_window()
+        log_window = self.finder.get_window_by_title('Log')
+        self._prompt_hwnd = prompt_window.hwnd if prompt_window else None
+        self._prompt_win = None
+        
+        log_hwnd = log_window.hwnd if log_window else None
+        if self._log_hwnd:
+            forget_child_hwnds(self._log_hwnd)
+        if log_hwnd != self._log_hwnd:
+            # Point the background reader at the new log window
+            if self.log_watcher:
+                self.log_watcher.stop()
+                self.log_watcher = None
+            if log_hwnd:
+                self.log_watcher = LogWatcher(log_hwnd)
+                self.log_watcher.start()
+        self._log_hwnd = log_hwnd
+    
+    def _defer(self, fmt, *args):
+        """Keep a detail line to be formatted and printed after the measurements."""
+        self._log.append((fmt, args))
+    
+    def _flush_log(self):
+        """Print pending progress, then the deferred detail lines."""
+        self._progress.flush()
+        for fmt, args in self._log:
+            print(fmt.format(*args))
+        self._log.clear()
+    
+    def _cached_window(self, cached, hwnd):
+        """Reuse a cached (hwnd, window) pair while the handle is unchanged, else wrap the new handle."""
+        if cached is None or cached[0] != hwnd:
+            cached = (hwnd, get_window(hwnd))
+        return cached
+    
     def send_command_with_timing(self, command, measure_latency=True):
         """Send command using smart clearing and optionally measure timing."""
         # Get prompt window
-        prompt_data = self.finder.get_prompt_window()
-        if not prompt_data:
-            return {'success': False, 'error': 'Prompt window not found', 'timing': None}
+        if not self._prompt_hwnd:
+            self._revalidate_handles()
+            if not self._prompt_hwnd:
+                return {'success': False, 'error': 'Prompt window not found', 'timing': None}
         
         try:
-            # Connect with pywinauto
-            app = Application().connect(handle=prompt_data['hwnd'])
-            window = app.window(handle=prompt_data['hwnd'])
+            self._prompt_win = self._cached_window(self._prompt_win, self._prompt_hwnd)
+            window = self._prompt_win[1]
             
             # Record start time
-            start_time = time.perf_counter()
+            start_ns = time.perf_counter_ns()
             
             # Smart clearing approach
             window.set_focus()
@@ -55,58 +284,200 @@ class ReliabilityTester:
             window.type_keys("{ENTER}")
             
             # Record command sent time
-            command_sent_time = time.perf_counter()
+            command_sent_ns = time.perf_counter_ns()
             
             if not measure_latency:
-                return {'success': True, 'error': None, 'timing': command_sent_time - start_time}
+                return {'success': True, 'error': None, 'timing': (command_sent_ns - start_ns) / 1e9}
             
             # Wait for response in log window if measuring latency
             response_time = self.wait_for_log_response(command, timeout=5.0)
-            end_time = time.perf_counter()
+            end_ns = time.perf_counter_ns()
             
             timing_data = {
-                'command_input_time': command_sent_time - start_time,
-                'total_response_time': end_time - start_time,
+                'command_input_time': (command_sent_ns - start_ns) / 1e9,
+                'total_response_time': (end_ns - start_ns) / 1e9,
                 'processing_time': response_time if response_time else None
             }
             
             return {'success': True, 'error': None, 'timing': timing_data}
             
         except Exception as e:
+            # Look the windows up again for the next command in case they went stale
+            self._revalidate_handles()
             return {'success': False, 'error': str(e), 'timing': None}
     
+    def close(self):
+        """Stop the background log reader and restore the thread's scheduling."""
+        if self.log_watcher:
+            self.log_watcher.stop()
+            self.log_watcher = None
+        _unpin_measurement_thread(self._saved_thread_state)
+        self._saved_thread_state = None
+    
     def wait_for_log_response(self, command, timeout=5.0):
-        """Wait for command to appear in log and return response time."""
-        start_time = time.perf_counter()
+        """Wait for command to appear in log and return response time.
+        
+        Takes log snapshots from the background LogWatcher and records the
+        achieved read period, so sleep jitter can be told apart from game
+        latency in the report.
+        """
+        if self.log_watcher is None:
+            return self._poll_log_response(command, timeout)
         
-        while time.perf_counter() - start_time < timeout:
-            if self.check_command_in_log(command):
-                return time.perf_counter() - start_time
-            time.sleep(0.1)
+        start_ns = time.perf_counter_ns()
+        deadline_ns = start_ns + int(timeout * 1e9)
+        first_ns = last_ns = None
+        reads = 0
         
-        return None  # Timeout
+        try:
+            while True:
+                remaining_ns = deadline_ns - time.perf_counter_ns()
+                if remaining_ns <= 0:
+                    return None  # Timeout
+                try:
+                    read_ns, text = self.log_watcher.queue.get(timeout=remaining_ns / 1e9)
+                except queue.Empty:
+                    return None  # Timeout
+                if read_ns < start_ns:
+                    continue  # Read before the wait started
+                
+                first_ns = first_ns or read_ns
+                last_ns = read_ns
+                reads += 1
+                if command in text:
+                    return (read_ns - start_ns) / 1e9
+        finally:
+            if reads > 1:
+                self.results['poll_periods'].update((last_ns - first_ns) / (reads - 1) / 1e9)
+    
+    def _poll_log_response(self, command, timeout):
+        """Poll the log directly at a fixed LOG_POLL_INTERVAL rate when there is no LogWatcher."""
+        interval_ns = int(LOG_POLL_INTERVAL * 1e9)
+        deadline_ns = time.perf_counter_ns() + int(timeout * 1e9)
+        start_ns = time.perf_counter_ns()
+        next_poll_ns = start_ns
+        last_poll_ns = start_ns
+        polls = 0
+        
+        try:
+            while True:
+                last_poll_ns = time.perf_counter_ns()
+                polls += 1
+                if self.check_command_in_log(command):
+                    return (time.perf_counter_ns() - start_ns) / 1e9
+                
+                # Fixed rate: schedule from the previous tick, not from now
+                next_poll_ns += interval_ns
+                if next_poll_ns >= deadline_ns:
+                    return None  # Timeout
+                remaining_ns = next_poll_ns - time.perf_counter_ns()
+                if remaining_ns > 0:
+                    _hr_sleep(remaining_ns / 1e9)
+        finally:
+            if polls > 1:
+                self.results['poll_periods'].update((last_poll_ns - start_ns) / (polls - 1) / 1e9)
     
     def check_command_in_log(self, command):
         """Quick check if command appears in log."""
-        log_window = self.finder.get_window_by_title('Log')
-        if not log_window:
+        if not self._log_hwnd:
             return False
         
         try:
-            app = Application().connect(handle=log_window['hwnd'])
-            window = app.window(handle=log_window['hwnd'])
-            
-            # Quick text extraction
-            children = window.children()
-            for child in children:
-                child_text = child.window_text()
-                if command in child_text:
+            # Quick text extraction: WM_GETTEXT straight to the cached child controls
+            for child_hwnd in get_child_hwnds(self._log_hwnd):
+                if command in control_text(child_hwnd):
                     return True
             return False
             
         except Exception:
+            self._revalidate_handles()
             return False
     
+    def read_log_text(self):
+        """Read the whole log text with WM_GETTEXT on its child controls, or None if unavailable."""
+        if not self._log_hwnd:
+            return None
+        
+        try:
+            return '\n'.join(control_text(child_hwnd) for child_hwnd in get_child_hwnds(self._log_hwnd))
+        except Exception:
+            self._revalidate_handles()
+            return None
+    
+    def find_commands_in_log(self, commands):
+        """Return the subset of commands that appear in the log, reading the log only once."""
+        log_text = self.read_log_text()
+        if log_text is None:
+            return set()
+        
+        return {command for command in set(commands) if command in log_text}
+    
+    def wait_for_log_match_or_quiet(self, command, interval=0.02, max_wait=1.0, quiet_polls=3):
+        """Wait until command shows up in the log or the log stops changing.
+        
+        Polls every interval seconds. Gives up once the log length has stayed
+        the same for quiet_polls polls in a row, or after max_wait seconds.
+        Returns True if the command was found.
+        """
+        deadline = time.perf_counter() + max_wait
+        last_length = None
+        unchanged = 0
+        
+        while True:
+            log_text = self.read_log_text()
+            if log_text is not None:
+                if command in log_text:
+                    return True
+                if len(log_text) == last_length:
+                    unchanged += 1
+                    if unchanged >= quiet_polls:
+                        return False
+                else:
+                    unchanged = 0
+                    last_length = len(log_text)
+            
+            if time.perf_counter() + interval > deadline:
+                return False
+            _hr_sleep(interval)
+    
+    def _match_sent_commands(self, sent, matched, done, grace=5.0):
+        """Match sent commands against LogWatcher snapshots while the sender keeps going.
+        
+        sent is a deque the sender appends (command, sent_ns, log_length) to,
+        with the time and log length taken just before the command was sent.
+        New log lines are added at the top, so only the first
+        len(text) - log_length characters of a later snapshot are searched;
+        older echoes of a repeated command do not count. Each command found
+        goes to matched as (command, latency seconds). Once done is set, keeps
+        looking for the rest for up to grace seconds.
+        """
+        waiting = []
+        give_up_ns = None
+        
+        while True:
+            while sent:
+                waiting.append(sent.popleft())
+            if done.is_set():
+                if give_up_ns is None:
+                    give_up_ns = time.perf_counter_ns() + int(grace * 1e9)
+                if not waiting or time.perf_counter_ns() > give_up_ns:
+                    return
+            
+            try:
+                read_ns, text = self.log_watcher.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            still_waiting = []
+            for entry in waiting:
+                command, sent_ns, log_length = entry
+                new_text = text if log_length is None else text[:max(0, len(text) - log_length)]
+                if read_ns >= sent_ns and command in new_text:
+                    matched.append((command, (read_ns - sent_ns) / 1e9))
+                else:
+                    still_waiting.append(entry)
+            waiting = still_waiting
+    
     def test_rapid_command_sequences(self):
         """Test 5.2.1: Rapid command sequences with smart clearing."""
         print("\n" + "="*60)
@@ -123,17 +494,34 @@ class ReliabilityTester:
             test_commands = commands[:seq_length]
             sequence_start = time.perf_counter()
             success_count = 0
-            timings = []
+            timing_stats = RunningStats()
+            
+            # Verify against the log on a separate thread while commands are still being sent
+            sent = deque()
+            matched = []
+            done = threading.Event()
+            matcher = None
+            if self.log_watcher:
+                matcher = threading.Thread(target=self._match_sent_commands, args=(sent, matched, done), daemon=True)
+                matcher.start()
             
             for i, cmd in enumerate(test_commands):
-                print(f"  Command {i+1}/{seq_length}: '{cmd}'")
+                self._progress.post(f"  Command {i+1}/{seq_length}: '{cmd}'")
+                
+                # Log length and time just before sending, so only this command's echo counts
+                log_length = None
+                if matcher:
+                    log_text = self.read_log_text()
+                    log_length = len(log_text) if log_text is not None else None
+                sent_ns = time.perf_counter_ns()
                 result = self.send_command_with_timing(cmd, measure_latency=False)
                 
                 if result['success']:
                     success_count += 1
-                    timings.append(result['timing'])
+                    timing_stats.update(result['timing'])
+                    sent.append((cmd, sent_ns, log_length))
                 else:
-                    print(f"    [ERROR] {result['error']}")
+                    self._defer("    [ERROR] Command {}: {}", i + 1, result['error'])
                 
                 # Small delay between commands
                 time.sleep(0.1)
@@ -141,19 +529,36 @@ class ReliabilityTester:
             sequence_end = time.perf_counter()
             total_time = sequence_end - sequence_start
             
+            done.set()
+            if matcher:
+                matcher.join()
+            self._flush_log()
+            
+            log_latency_stats = RunningStats()
+            for _, latency in matched:
+                log_latency_stats.update(latency)
+            
             sequence_result = {
                 'length': seq_length,
                 'success_count': success_count,
                 'success_rate': success_count / seq_length,
                 'total_time': total_time,
-                'average_command_time': statistics.mean(timings) if timings else 0,
-                'timings': timings
+                'average_command_time': timing_stats.mean,
+                'timing_stats': timing_stats,
+                'verified_count': len(matched),
+                'log_latency_stats': log_latency_stats
             }
             
             self.results['rapid_sequences'].append(sequence_result)
             
             print(f"  Results: {success_count}/{seq_length} successful ({sequence_result['success_rate']:.1%})")
             print(f"  Total time: {total_time:.2f}s, Avg per command: {sequence_result['average_command_time']:.3f}s")
+            if matcher:
+                print(f"  Verified in log: {len(matched)}/{success_count}", end="")
+                if matched:
+                    print(f", avg log latency: {log_latency_stats.mean:.3f}s")
+                else:
+                    print()
     
     def test_command_buffering(self):
         """Test 5.2.2: Command buffering and queuing behavior."""
@@ -180,9 +585,10 @@ class ReliabilityTester:
         time.sleep(3.0)
         
         # Check which commands made it to log
+        found = self.find_commands_in_log(commands)
         verified_count = 0
         for test in results:
-            if self.check_command_in_log(test['command']):
+            if test['command'] in found:
                 verified_count += 1
                 print(f"  [OK] '{test['command']}' found in log")
             else:
@@ -208,46 +614,47 @@ class ReliabilityTester:
         
         # Test commands with different expected response types
         test_commands = ["info", "help", "version"]
-        measurements_per_command = 5
+        measurements_per_command = LATENCY_MEASUREMENTS
         
         for command in test_commands:
             print(f"\nMeasuring latency for '{command}' command...")
-            command_measurements = []
+            input_stats = RunningStats()
+            response_stats = RunningStats()
             
             for i in range(measurements_per_command):
-                print(f"  Measurement {i+1}/{measurements_per_command}")
+                self._progress.post(f"  Measurement {i+1}/{measurements_per_command}")
                 
                 result = self.send_command_with_timing(command, measure_latency=True)
                 
                 if result['success'] and result['timing']:
                     timing = result['timing']
-                    command_measurements.append(timing)
+                    input_stats.update(timing['command_input_time'])
+                    if timing['processing_time']:
+                        response_stats.update(timing['processing_time'])
                     
-                    print(f"    Input time: {timing['command_input_time']:.3f}s")
+                    self._defer("    [{}] Input time: {:.3f}s", i + 1, timing['command_input_time'])
                     if timing['processing_time']:
-                        print(f"    Response time: {timing['processing_time']:.3f}s")
-                        print(f"    Total time: {timing['total_response_time']:.3f}s")
+                        self._defer("    [{}] Response time: {:.3f}s", i + 1, timing['processing_time'])
+                        self._defer("    [{}] Total time: {:.3f}s", i + 1, timing['total_response_time'])
                     else:
-                        print(f"    Response: TIMEOUT")
+                        self._defer("    [{}] Response: TIMEOUT", i + 1)
                 else:
-                    print(f"    ERROR: {result['error']}")
+                    self._defer("    [{}] ERROR: {}", i + 1, result['error'])
                 
                 # Wait between measurements
                 time.sleep(1.0)
             
-            if command_measurements:
-                # Calculate statistics
-                input_times = [m['command_input_time'] for m in command_measurements]
-                response_times = [m['processing_time'] for m in command_measurements if m['processing_time']]
-                
+            self._flush_log()
+            
+            if input_stats.n:
                 latency_stats = {
                     'command': command,
-                    'sample_count': len(command_measurements),
-                    'input_time_avg': statistics.mean(input_times),
-                    'input_time_stdev': statistics.stdev(input_times) if len(input_times) > 1 else 0,
-                    'response_time_avg': statistics.mean(response_times) if response_times else None,
-                    'response_time_stdev': statistics.stdev(response_times) if len(response_times) > 1 else 0,
-                    'timeout_count': len([m for m in command_measurements if not m['processing_time']])
+                    'sample_count': input_stats.n,
+                    'input_time_avg': input_stats.mean,
+                    'input_time_stdev': input_stats.stdev,
+                    'response_time_avg': response_stats.mean if response_stats.n else None,
+                    'response_time_stdev': response_stats.stdev,
+                    'timeout_count': input_stats.n - response_stats.n
                 }
                 
                 self.results['latency_measurements'].append(latency_stats)
@@ -283,9 +690,8 @@ class ReliabilityTester:
             result = self.send_command_with_timing(cmd, measure_latency=True)
             
             if result['success']:
-                # Check if there's any response in log
-                time.sleep(1.0)
-                has_response = self.check_command_in_log(cmd) if cmd.strip() else False
+                # Check if there's any response in log, giving up early once it goes quiet
+                has_response = self.wait_for_log_match_or_quiet(cmd) if cmd.strip() else False
                 
                 error_result = {
                     'command': cmd,
@@ -347,6 +753,11 @@ class ReliabilityTester:
             if result['timeout_count'] > 0:
                 print(f"  Timeouts: {result['timeout_count']}/{result['sample_count']}")
         
+        # Polling accuracy summary
+        periods = self.results['poll_periods']
+        if periods.n:
+            print(f"Log polling period: {periods.mean*1000:.1f}ms avg, {periods.max*1000:.1f}ms max (target {LOG_POLL_INTERVAL*1000:.0f}ms)")
+        
         # Error handling summary
         print("\n" + "-"*60)
         print("5.2.4 ERROR HANDLING SUMMARY")
@@ -404,8 +815,8 @@ def main():
         print("\n[ERROR] Log window not found. Is Text the Spire running?")
         return False
     
-    print(f"\n[OK] Found prompt window: '{prompt_window['title']}'")
-    print(f"[OK] Found log window: '{log_window['title']}'")
+    print(f"\n[OK] Found prompt window: '{prompt_window.title}'")
+    print(f"[OK] Found log window: '{log_window.title}'")
     print("\nStarting automated testing...")
     
     tester = ReliabilityTester()
@@ -430,6 +841,8 @@ def main():
     except Exception as e:
         print(f"\n[ERROR] Testing failed: {e}")
         return False
+    finally:
+        tester.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
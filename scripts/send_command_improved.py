@@ -6,12 +6,14 @@ Improved command sending that handles both empty and non-empty prompts.
 import sys
 import os
 import time
-from pywinauto import Application
 
-# Add scripts directory to path for imports
+# Add scripts and src directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../scripts'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
 
 from reliable_window_finder import TextTheSpireWindowFinder
+from window_reader import get_window, read_window_text
+from utils.ui_helpers import wait_until, escape_pywinauto_keys
 
 def send_command_smart(command="info"):
     """Send a command using smart clearing that works whether prompt is empty or not."""
@@ -23,32 +25,25 @@ def send_command_smart(command="info"):
         print("[ERROR] Prompt window not found")
         return False
     
-    print(f"[OK] Found prompt window: '{prompt_data['title']}' (Handle: {prompt_data['hwnd']})")
+    print(f"[OK] Found prompt window: '{prompt_data.title}' (Handle: {prompt_data.hwnd})")
     
     try:
-        # Connect with pywinauto
-        app = Application().connect(handle=prompt_data['hwnd'])
-        window = app.window(handle=prompt_data['hwnd'])
+        # Connect with pywinauto (reused across calls for the same handle)
+        window = get_window(prompt_data.hwnd)
         
         print(f"[INFO] Sending '{command}' command...")
         window.set_focus()
-        time.sleep(0.1)
+        wait_until(window.is_active, 0.1)
         
-        # Smart clearing approach:
+        # Smart clearing approach, sent as one key sequence:
         # 1. Type a space (won't trigger error sound even if empty)
         # 2. Select all (selects space + any existing content)
         # 3. Type the command (replaces selection)
+        # 4. Enter executes it
         
-        print("[INFO] Smart clearing prompt...")
-        window.type_keys(" ")      # Type space (no error sound)
-        time.sleep(0.05)
-        window.type_keys("^a")     # Select all
-        time.sleep(0.05)
-        window.type_keys(command)  # Type command (replaces selection)
-        time.sleep(0.1)
-        
-        print("[INFO] Executing command...")
-        window.type_keys("{ENTER}")
+        print("[INFO] Smart clearing prompt and executing command...")
+        keys = " ^a" + escape_pywinauto_keys(command) + "{ENTER}"
+        window.type_keys(keys, pause=0.01, with_spaces=True)
         
         print(f"[OK] Command '{command}' sent successfully")
         return True
@@ -71,19 +66,8 @@ def verify_command_in_log(command):
         return False
     
     try:
-        # Connect and read content
-        app = Application().connect(handle=log_window['hwnd'])
-        window = app.window(handle=log_window['hwnd'])
-        
-        # Extract text
-        children = window.children()
-        all_text = []
-        for child in children:
-            child_text = child.window_text()
-            if child_text.strip():
-                all_text.append(child_text)
-        
-        log_content = '\n'.join(all_text).strip()
+        # Read content through the cached connection
+        log_content = read_window_text(log_window.hwnd)
         
         # Check if command is in log
         if command in log_content:
@@ -111,7 +95,7 @@ def test_window_title_change(command="info"):
         print("[ERROR] Prompt window not found")
         return
     
-    print(f"\n[BEFORE] Prompt window title: '{prompt_before['title']}'")
+    print(f"\n[BEFORE] Prompt window title: '{prompt_before.title}'")
     
     # Send command
     success = send_command_smart(command)
@@ -131,12 +115,12 @@ def test_window_title_change(command="info"):
         print("[ERROR] Prompt window not found after command")
         return
     
-    print(f"\n[AFTER] Prompt window title: '{prompt_after['title']}'")
+    print(f"\n[AFTER] Prompt window title: '{prompt_after.title}'")
     
-    if prompt_before['title'] != prompt_after['title']:
-        print(f"\n[DISCOVERY] Window title changed from '{prompt_before['title']}' to '{prompt_after['title']}'!")
+    if prompt_before.title != prompt_after.title:
+        print(f"\n[DISCOVERY] Window title changed from '{prompt_before.title}' to '{prompt_after.title}'!")
     else:
-        print(f"\n[RESULT] Window title unchanged (still '{prompt_after['title']}')")
+        print(f"\n[RESULT] Window title unchanged (still '{prompt_after.title}')")
 
 if __name__ == "__main__":
     print("IMPROVED COMMAND SENDING TEST")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Event-driven window change notifications.
+Uses SetWinEventHook so monitors only re-check windows when a top-level
+window is created, destroyed, shown, hidden or renamed, instead of polling
+on a timer.
+"""
+
+import ctypes
+import ctypes.wintypes
+import threading
+import time
+from typing import FrozenSet, Optional
+
+
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WM_QUIT = 0x0012
+
+try:
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None,
+        ctypes.wintypes.HANDLE,  # hWinEventHook
+        ctypes.wintypes.DWORD,   # event
+        ctypes.wintypes.HWND,    # hwnd
+        ctypes.wintypes.LONG,    # idObject
+        ctypes.wintypes.LONG,    # idChild
+        ctypes.wintypes.DWORD,   # idEventThread
+        ctypes.wintypes.DWORD,   # dwmsEventTime
+    )
+except AttributeError:
+    # Not on Windows
+    WinEventProc = None
+
+
+class WindowEventWatcher:
+    """Signals when a top-level window is created, destroyed, shown, hidden or renamed.
+    
+    Hooks run on a helper thread with its own message loop. Pass process_id
+    to only watch windows of one process (0 watches all processes), and
+    class_names to only count windows of those classes. A destroyed window's
+    class can no longer be read, so destroy events always count.
+    """
+    
+    def __init__(self, process_id: int = 0, class_names: Optional[FrozenSet[str]] = None):
+        self.process_id = process_id
+        self.class_names = class_names
+        self._changed = threading.Event()
+        self._ready = threading.Event()
+        self._thread_id = None
+        self._hooked = False
+        # Keep a reference so the callback is not garbage collected while hooked
+        self._callback = WinEventProc(self._on_event)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self) -> bool:
+        """Install the hooks. Returns False if they could not be installed."""
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self._hooked
+    
+    def stop(self) -> None:
+        """Remove the hooks and end the helper thread."""
+        if self._thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=5)
+    
+    def wait(self, timeout: Optional[float] = None, settle: float = 0.5) -> bool:
+        """Wait for a window change.
+        
+        Windows tend to change in bursts, so after the first event this waits
+        another settle seconds before returning. Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        # Wait in short slices so Ctrl+C is handled promptly on Windows
+        while True:
+            if deadline is None:
+                slice_timeout = 1.0
+            else:
+                slice_timeout = min(1.0, deadline - time.monotonic())
+                if slice_timeout <= 0:
+                    return False
+            if self._changed.wait(slice_timeout):
+                break
+        
+        time.sleep(settle)
+        self._changed.clear()
+        return True
+    
+    def poll(self) -> bool:
+        """Check without blocking whether a window changed since the last wait() or poll()."""
+        if self._changed.is_set():
+            self._changed.clear()
+            return True
+        return False
+    
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        """WinEvent callback; only top-level windows count as changes."""
+        if id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+            return
+        
+        # The window is already gone on destroy, so its class cannot be checked
+        if self.class_names is not None and event != EVENT_OBJECT_DESTROY:
+            buffer = ctypes.create_unicode_buffer(256)
+            if not ctypes.windll.user32.GetClassNameW(hwnd, buffer, 256):
+                return
+            if buffer.value not in self.class_names:
+                return
+        
+        self._changed.set()
+    
+    def _run(self) -> None:
+        """Install the hooks and pump messages until stop() posts WM_QUIT."""
+        user32 = ctypes.windll.user32
+        user32.SetWinEventHook.restype = ctypes.wintypes.HANDLE
+        user32.UnhookWinEvent.argtypes = [ctypes.wintypes.HANDLE]
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        
+        hooks = [
+            user32.SetWinEventHook(EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE, 0,
+                                   self._callback, self.process_id, 0, flags),
+            user32.SetWinEventHook(EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, 0,
+                                   self._callback, self.process_id, 0, flags),
+        ]
+        self._hooked = all(hooks)
+        self._ready.set()
+        
+        try:
+            if self._hooked:
+                msg = ctypes.wintypes.MSG()
+                while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                    user32.TranslateMessage(ctypes.byref(msg))
+                    user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+
+
+def start_watcher(process_id: int = 0,
+                  class_names: Optional[FrozenSet[str]] = None) -> Optional[WindowEventWatcher]:
+    """Start a window event watcher, or return None if hooks are unavailable."""
+    if WinEventProc is None:
+        return None
+    
+    watcher = WindowEventWatcher(process_id, class_names)
+    if not watcher.start():
+        watcher.stop()
+        return None
+    return watcher
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Read text content from Text the Spire windows.
+Reads of several windows run in a thread pool so the per-window pywinauto
+round trips overlap instead of adding up. pywinauto is only imported when a
+window wrapper is first needed, so the ctypes helpers work without it.
+"""
+
+import ctypes
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+import win32gui
+
+
+WM_GETTEXT = 0x000D
+WM_GETTEXTLENGTH = 0x000E
+
+# pywinauto Application per window handle, reused while the handle stays valid
+_APP_CACHE: Dict[int, Any] = {}
+
+# Child control handles per window; the controls of a game window do not change
+_CHILD_CACHE: Dict[int, List[int]] = {}
+
+
+def get_app(hwnd: int) -> Any:
+    """Get a pywinauto Application connected to a window, connecting only once per handle."""
+    app = _APP_CACHE.get(hwnd)
+    if app is None or not win32gui.IsWindow(hwnd):
+        from pywinauto import Application
+        
+        # win32 is pywinauto's default backend; naming it just pins that choice
+        app = Application(backend="win32").connect(handle=hwnd)
+        _APP_CACHE[hwnd] = app
+    return app
+
+
+def get_window(hwnd: int):
+    """Get the pywinauto window wrapper for a handle through the cached Application."""
+    return get_app(hwnd).window(handle=hwnd)
+
+
+def window_text(window) -> str:
+    """Join the non-empty text of a pywinauto window's children."""
+    all_text = []
+    for child in window.children():
+        child_text = child.window_text()
+        if child_text.strip():
+            all_text.append(child_text)
+    
+    return '\n'.join(all_text).strip()
+
+
+def read_window_text(hwnd: int) -> str:
+    """Read a window's text by handle."""
+    return window_text(get_window(hwnd))
+
+
+def get_child_hwnds(hwnd: int) -> List[int]:
+    """Get a window's child control handles, enumerating them only once per handle."""
+    children = _CHILD_CACHE.get(hwnd)
+    if children is None:
+        children = []
+        try:
+            win32gui.EnumChildWindows(hwnd, lambda child, found: found.append(child) or True, children)
+        except Exception:
+            # pywin32 raises for windows without children
+            pass
+        _CHILD_CACHE[hwnd] = children
+    return children
+
+
+def forget_child_hwnds(hwnd: int) -> None:
+    """Drop the cached child handles of a window so they are enumerated again."""
+    _CHILD_CACHE.pop(hwnd, None)
+
+
+def control_text(hwnd: int) -> str:
+    """Read a control's text with WM_GETTEXT, without going through pywinauto."""
+    user32 = ctypes.windll.user32
+    length = user32.SendMessageW(hwnd, WM_GETTEXTLENGTH, 0, 0)
+    buffer = ctypes.create_unicode_buffer(length + 1)
+    user32.SendMessageW(hwnd, WM_GETTEXT, length + 1, buffer)
+    return buffer.value
+
+
+def read_windows_parallel(hwnds: List[int],
+                          reader: Callable[[int], str] = read_window_text,
+                          max_workers: int = 4) -> Dict[int, str]:
+    """Read several windows concurrently.
+    
+    Returns {hwnd: text}. An exception raised while reading any window is
+    re-raised here.
+    """
+    if len(hwnds) == 1:
+        # Nothing to overlap, skip the pool
+        return {hwnds[0]: reader(hwnds[0])}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {hwnd: executor.submit(reader, hwnd) for hwnd in hwnds}
+        return {hwnd: future.result() for hwnd, future in futures.items()}
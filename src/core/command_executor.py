@@ -1,23 +1,34 @@
 """Command execution module for Text the Spire integration."""
 
+import ctypes
+import ctypes.wintypes
 import time
-from typing import List, Optional
-from pywinauto import Application
+from typing import List, Optional, Tuple
 
 from sts_types import CommandResult
 from utils.constants import (
-    QUICK_COMMAND_WAIT, SLOW_COMMAND_WAIT, 
+    QUICK_COMMAND_WAIT, SLOW_COMMAND_WAIT, LOG_QUIET_PERIOD,
     SLOW_COMMANDS,
     AVERAGE_INPUT_LATENCY, PROMPT_WINDOW_TITLES
 )
-from .text_extractor import read_window, _get_window_handle
+from utils.ui_helpers import wait_until, escape_pywinauto_keys
+from .text_extractor import read_window, get_text_length, _get_window_handle, _use_window
+
+# Lowercase slow command names, for matching commands that are typed as-is
+_SLOW_SET_LOWER = frozenset(name.lower() for name in SLOW_COMMANDS)
 
 def get_command_wait_time(command: str) -> float:
     """Determine wait time based on command type."""
+    # Fast path: a bare single-word command needs no stripping or splitting
+    if command in _SLOW_SET_LOWER:
+        return SLOW_COMMAND_WAIT
+    if command.isalpha():
+        return SLOW_COMMAND_WAIT if command.lower() in _SLOW_SET_LOWER else QUICK_COMMAND_WAIT
+    
     # Extract first word from command for categorization
     first_word = command.strip().split()[0].lower() if command.strip() else ""
     
-    if first_word in SLOW_COMMANDS:
+    if first_word in _SLOW_SET_LOWER:
         return SLOW_COMMAND_WAIT
     else:
         # Default to quick command wait time
@@ -30,35 +41,116 @@ def read_log_window() -> Optional[str]:
         return None
     return result["content"]
 
-def send_command_to_prompt(command: str) -> bool:
-    """Send command to prompt window using smart clearing approach."""
-    # Try to find prompt window by checking all known prompt window titles
-    prompt_handle = None
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+VK_SHIFT = 0x10
+VK_CONTROL = 0x11
+VK_RETURN = 0x0D
+VK_SPACE = 0x20
+VK_A = 0x41
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.wintypes.WORD),
+        ("wScan", ctypes.wintypes.WORD),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("time", ctypes.wintypes.DWORD),
+        ("dwExtraInfo", ctypes.wintypes.WPARAM),
+    ]
+
+class MOUSEINPUT(ctypes.Structure):
+    # Only here so INPUT has the size SendInput expects
+    _fields_ = [
+        ("dx", ctypes.wintypes.LONG),
+        ("dy", ctypes.wintypes.LONG),
+        ("mouseData", ctypes.wintypes.DWORD),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("time", ctypes.wintypes.DWORD),
+        ("dwExtraInfo", ctypes.wintypes.WPARAM),
+    ]
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.wintypes.DWORD), ("union", _INPUTUNION)]
+
+def _key_input(vk: int = 0, scan: int = 0, flags: int = 0) -> INPUT:
+    """Build one keyboard INPUT record."""
+    return INPUT(type=INPUT_KEYBOARD, union=_INPUTUNION(ki=KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)))
+
+def _char_inputs(char: str) -> List[INPUT]:
+    """Key down/up records that type one character, holding Shift when the layout needs it."""
+    scan = ctypes.windll.user32.VkKeyScanW(ord(char))
+    if scan == -1 or scan & 0x0600:
+        # No plain or shifted key on this layout, send the character itself
+        return [_key_input(scan=ord(char), flags=KEYEVENTF_UNICODE),
+                _key_input(scan=ord(char), flags=KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)]
+    
+    vk = scan & 0xFF
+    inputs = [_key_input(vk), _key_input(vk, flags=KEYEVENTF_KEYUP)]
+    if scan & 0x0100:
+        inputs = [_key_input(VK_SHIFT)] + inputs + [_key_input(VK_SHIFT, flags=KEYEVENTF_KEYUP)]
+    return inputs
+
+def _send_keys_raw(command: str) -> bool:
+    """Type the smart clearing sequence (space, Ctrl+A, command, Enter) with a single SendInput call.
+    
+    Returns False if SendInput did not insert every key event.
+    """
+    inputs = [
+        _key_input(VK_SPACE), _key_input(VK_SPACE, flags=KEYEVENTF_KEYUP),
+        _key_input(VK_CONTROL), _key_input(VK_A), _key_input(VK_A, flags=KEYEVENTF_KEYUP),
+        _key_input(VK_CONTROL, flags=KEYEVENTF_KEYUP),
+    ]
+    for char in command:
+        inputs.extend(_char_inputs(char))
+    inputs += [_key_input(VK_RETURN), _key_input(VK_RETURN, flags=KEYEVENTF_KEYUP)]
+    
+    array = (INPUT * len(inputs))(*inputs)
+    sent = ctypes.windll.user32.SendInput(len(inputs), array, ctypes.sizeof(INPUT))
+    return sent == len(inputs)
+
+def _find_prompt_handle() -> Optional[int]:
+    """Find the prompt window by checking all known prompt window titles."""
     for title in PROMPT_WINDOW_TITLES:
         handle = _get_window_handle(title)
         if handle:
-            prompt_handle = handle
-            break
+            return handle
+    return None
+
+def send_command_to_prompt(command: str, use_ctypes: bool = True,
+                           prompt_handle: Optional[int] = None) -> bool:
+    """Send command to prompt window using smart clearing approach.
     
+    Keys go straight to SendInput unless use_ctypes is False, which falls
+    back to pywinauto's type_keys. Pass prompt_handle to skip looking the
+    prompt window up. Returns False without typing anything if the prompt
+    does not become the foreground window.
+    """
+    if not prompt_handle:
+        prompt_handle = _find_prompt_handle()
     if not prompt_handle:
         return False
     
-    try:
-        app = Application().connect(handle=prompt_handle)
-        window = app.window(handle=prompt_handle)
-        
+    def type_command(window) -> bool:
         window.set_focus()
-        time.sleep(0.1)
-        
-        # Smart clearing approach from existing implementation
-        window.type_keys("^a")     # Select all
-        time.sleep(0.05)
-        command = command.replace( ' ', '{SPACE}' )
-        window.type_keys(command)  # Type command (replaces selection if any)
-        time.sleep(0.1)
-        window.type_keys("{ENTER}")
+        # Keys go to whatever window is in the foreground, so never type
+        # unless the prompt really got focus (it can be refused or slow)
+        if not wait_until(lambda: ctypes.windll.user32.GetForegroundWindow() == prompt_handle, 0.1):
+            return False
         
+        # Smart clearing in one key sequence: space (no error sound even if empty),
+        # select all, type command (replaces selection), execute
+        if use_ctypes:
+            return _send_keys_raw(command)
+        keys = " ^a" + escape_pywinauto_keys(command) + "{ENTER}"
+        window.type_keys(keys, pause=0.01, with_spaces=True)
         return True
+    
+    try:
+        return _use_window(prompt_handle, type_command)
     except Exception:
         return False
 
@@ -70,16 +162,18 @@ def extract_log_difference(before_log: str, after_log: str) -> str:
     if not after_log:
         return ""
     
-    # Simple approach: if after_log is longer, return the difference
-    if len(after_log) > len(before_log):
-        # Check if after_log contains before_log as prefix
-        if after_log.endswith(before_log):
-            return after_log[:-len(before_log)].strip()
-        else:
-            # Logs may have been truncated/rotated, return full after_log
-            return after_log
+    # New lines are added at the top, so the new content is whatever precedes
+    # the old log; sizes alone tell how long it must be
+    new_length = len(after_log) - len(before_log)
+    if new_length <= 0:
+        return ""
+    
+    # One comparison of the old log against the tail of the new one
+    if after_log.startswith(before_log, new_length):
+        return after_log[:new_length].strip()
     
-    return ""
+    # Logs may have been truncated/rotated, return full after_log
+    return after_log
 
 def command_appears_in_log(command: str, log_content: str) -> bool:
     """Check if command appears in the log content."""
@@ -89,18 +183,58 @@ def command_appears_in_log(command: str, log_content: str) -> bool:
     # Simple check: command appears in log
     return command.lower() in log_content.lower()
 
-def execute_command(command: str, verify: bool = True, timeout: float = 5.0) -> CommandResult:
-    """Execute a command in the Prompt window and capture response."""
-    start_time = time.time()
+def _wait_for_log_quiet(before_log: str, max_wait: float, quiet_period: float = LOG_QUIET_PERIOD,
+                        poll: float = 0.005, max_poll: float = 0.05) -> Tuple[Optional[str], float, bool]:
+    """Wait until the log has changed and then stayed unchanged for quiet_period seconds.
+    
+    The log echoes a command right after it is sent and the game's output
+    follows later, so the first change does not mean the response is done.
+    Polls only the log's text length, so no copy of the log is made per
+    poll; the full text is read once at the end. The poll interval starts at
+    poll and doubles up to max_poll. Gives up after max_wait seconds.
+    Returns the last log read, the time actually waited and whether the log
+    went quiet.
+    """
+    start = time.perf_counter()
+    deadline = start + max_wait
+    
+    # Length first, so a change landing between the two reads is still seen
+    log_handle = _get_window_handle("Log")
+    length = get_text_length(log_handle) if log_handle else None
+    after_log = read_log_window()
+    last_change = start if after_log is not None and after_log != before_log else None
+    
+    while True:
+        now = time.perf_counter()
+        if last_change is not None and now - last_change >= quiet_period:
+            return read_log_window(), now - start, True
+        if now >= deadline:
+            break
+        time.sleep(min(poll, deadline - now))
+        poll = min(poll * 2, max_poll)
+        
+        if log_handle:
+            new_length = get_text_length(log_handle)
+            if new_length != length:
+                length = new_length
+                last_change = time.perf_counter()
+    
+    return read_log_window(), time.perf_counter() - start, False
+
+def _execute_command(command: str, verify: bool, start_time: float, before_log: Optional[str],
+                     prompt_handle: Optional[int] = None) -> Tuple[CommandResult, Optional[str]]:
+    """Send a command and build its result from the given before log.
     
+    Returns the result and, if the log was confirmed quiet after the
+    command, the log read then, which can serve as the before log of the
+    next command in a sequence. Otherwise the log is returned as None, since
+    late output of this command could still arrive.
+    """
     # Determine wait time based on command type
     wait_time = get_command_wait_time(command)
     
-    # Capture log state before command
-    before_log = read_log_window() if verify else None
-    
     # Send command
-    send_success = send_command_to_prompt(command)
+    send_success = send_command_to_prompt(command, prompt_handle=prompt_handle)
     if not send_success:
         return {
             "success": False,
@@ -110,13 +244,19 @@ def execute_command(command: str, verify: bool = True, timeout: float = 5.0) ->
             "command_found_in_log": False,
             "log_response": None,
             "error": "Failed to send command to prompt window"
-        }
+        }, None
     
-    # Wait for command processing
-    time.sleep(wait_time)
-    
-    # Capture log state after command
-    after_log = read_log_window() if verify else None
+    # Wait for command processing. Slow commands can keep writing to the log
+    # through their animations, so they always get the full wait; quick ones
+    # stop once the log has answered and gone quiet
+    log_quiet = False
+    if verify and before_log is not None and wait_time < SLOW_COMMAND_WAIT:
+        after_log, wait_used, log_quiet = _wait_for_log_quiet(before_log, wait_time)
+    else:
+        time.sleep(wait_time)
+        wait_used = wait_time
+        # Capture log state after command
+        after_log = read_log_window() if verify else None
     
     # Extract response and verify
     log_response = None
@@ -132,21 +272,45 @@ def execute_command(command: str, verify: bool = True, timeout: float = 5.0) ->
         "success": True,
         "command": command,
         "response_time": response_time,
-        "wait_time_used": wait_time,
+        "wait_time_used": wait_used,
         "command_found_in_log": command_found,
         "log_response": log_response,
         "error": None
-    }
+    }, after_log if log_quiet else None
+
+def execute_command(command: str, verify: bool = True, timeout: float = 5.0) -> CommandResult:
+    """Execute a command in the Prompt window and capture response."""
+    start_time = time.time()
+    
+    # Capture log state before command
+    before_log = read_log_window() if verify else None
+    
+    result, _ = _execute_command(command, verify, start_time, before_log)
+    return result
 
 def execute_command_sequence(commands: List[str], verify: bool = True, timeout: float = 5.0) -> List[CommandResult]:
-    """Execute a sequence of commands, waiting for each to complete."""
+    """Execute a sequence of commands, waiting for each to complete.
+    
+    The prompt window is looked up once. A command's after log is reused as
+    the next command's before log only when the log was confirmed quiet;
+    otherwise the log is read again right before the next command is sent,
+    so late output is not counted as the next command's response.
+    """
     results = []
+    prompt_handle = _find_prompt_handle()
+    log = None
     
     for command in commands:
-        result = execute_command(command, verify=verify, timeout=timeout)
+        if verify and log is None:
+            log = read_log_window()
+        
+        result, log = _execute_command(command, verify, time.time(), log, prompt_handle)
         results.append(result)
         
         # If command failed, still continue with remaining commands
         # but could add logic here to stop on failure if needed
+        if not result["success"]:
+            # The prompt window may have been recreated, look it up again
+            prompt_handle = _find_prompt_handle()
     
     return results
\ No newline at end of file
@@ -1,58 +1,96 @@
 """Route evaluation for Slay the Spire map paths."""
 
+import heapq
 import re
-from typing import List, Dict, Tuple, Optional
+from collections import OrderedDict
+from operator import attrgetter
+from typing import List, Dict, NamedTuple, Tuple, Optional
 from .text_extractor import read_window
 from .command_executor import execute_command_sequence
 
 
-def evaluate_all_routes(top_n: int = 10) -> List[Dict]:
+# Patterns compiled once at import instead of looked up per line
+_REST_RE = re.compile(r'Rest Floor:15 X:(\d+)')
+_DETAIL_RE = re.compile(r'\w+ \d+ \d+')
+# Encounter type with an optional count; a bare type (e.g. "Emerald") counts once
+_ENCOUNTER_RE = re.compile(r'\b(Elite|Emerald|Rest|Shop|Unknown|Monster|Treasure)\b(?:\s+(\d+))?')
+_KEYWORD_RE = re.compile(r'Elite|Monster|Rest|Shop|Unknown|Treasure|Emerald')
+
+
+# Encounter types in the order of an encounter counts tuple
+ENCOUNTER_TYPES = ('Elite', 'Emerald', 'Rest', 'Shop', 'Unknown', 'Monster', 'Treasure')
+_IDX = {name: index for index, name in enumerate(ENCOUNTER_TYPES)}
+
+
+# Parsed routes per (Map window content, rest site x), most recently used last.
+# The map content is part of the key because path results change as the player moves.
+_ROUTE_CACHE: "OrderedDict[Tuple[str, int], Tuple[Route, ...]]" = OrderedDict()
+_ROUTE_CACHE_SIZE = 64
+
+
+class Route(NamedTuple):
+    """A scored route to a floor 15 rest site."""
+    score: int
+    summary: str
+    detail: str
+    encounter_counts: Tuple[int, ...]  # Indexed like ENCOUNTER_TYPES
+    destination: str
+
+
+def clear_route_cache() -> None:
+    """Forget cached path results, e.g. after the map changed in a way its text does not show."""
+    _ROUTE_CACHE.clear()
+
+
+def _cache_routes(key: Tuple[str, int], routes: List[Route]) -> None:
+    """Store parsed routes, evicting the least recently used entry when full."""
+    _ROUTE_CACHE[key] = tuple(routes)
+    if len(_ROUTE_CACHE) > _ROUTE_CACHE_SIZE:
+        _ROUTE_CACHE.popitem(last=False)
+
+
+def evaluate_all_routes(top_n: int = 10) -> Tuple[List[Route], Optional[str]]:
     """
     Evaluate all possible routes to floor 15 rest sites.
     
-    Returns a list of the top N routes with their scores and details.
+    Returns (routes, error): the top N routes with their scores and details
+    and None, or an empty list and an error message on failure.
     """
     # Read the map window
     map_content = read_window("Map")
     if map_content['error']:
-        return [{'error': f"Failed to read Map window: {map_content['error']}"}]
+        return [], f"Failed to read Map window: {map_content['error']}"
     
     # Find all floor 15 rest sites
     rest_sites = parse_map_window(map_content['content'])
     if not rest_sites:
-        return [{'error': 'No floor 15 rest sites found'}]
+        return [], 'No floor 15 rest sites found'
     
-    # Collect all routes
+    # Collect all routes. The path commands share the Prompt and Output
+    # windows so they run one at a time; rest sites already queried for this
+    # exact map come from the cache.
     all_routes = []
     for x_coord in rest_sites:
-        routes = get_routes_to_rest_site(x_coord)
+        key = (map_content['content'], x_coord)
+        routes = _ROUTE_CACHE.get(key)
+        if routes is not None:
+            _ROUTE_CACHE.move_to_end(key)
+        else:
+            output = _query_path_output(x_coord)
+            if output is None:
+                continue
+            routes = parse_path_output(output, x_coord)
+            _cache_routes(key, routes)
         all_routes.extend(routes)
     
-    # Score and sort routes
-    scored_routes = []
+    # Remove duplicates based on summary, keeping the first of each; the score
+    # depends only on the summary, so duplicates score the same
+    unique_routes = {}
     for route in all_routes:
-        score = score_route(route['encounter_counts'])
-        scored_routes.append({
-            'score': score,
-            'summary': route['summary'],
-            'detail': route['detail'],
-            'encounter_counts': route['encounter_counts'],
-            'destination': route['destination']
-        })
-    
-    # Sort by score descending
-    scored_routes.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Remove duplicates based on summary
-    seen_summaries = set()
-    unique_routes = []
-    for route in scored_routes:
-        if route['summary'] not in seen_summaries:
-            seen_summaries.add(route['summary'])
-            unique_routes.append(route)
+        unique_routes.setdefault(route.summary, route)
     
-    # Return top N
-    return unique_routes[:top_n]
+    # Return top N by score descending (routes are scored as they are parsed)
+    return heapq.nlargest(top_n, unique_routes.values(), key=attrgetter('score')), None
 
 
 def parse_map_window(map_content: str) -> List[int]:
@@ -61,10 +99,9 @@ def parse_map_window(map_content: str) -> List[int]:
     Returns list of X coordinates.
     """
     rest_sites = []
-    pattern = r'Rest Floor:15 X:(\d+)'
     
     for line in map_content.split('\n'):
-        match = re.match(pattern, line.strip())
+        match = _REST_RE.match(line.strip())
         if match:
             x_coord = int(match.group(1))
             rest_sites.append(x_coord)
@@ -72,109 +109,101 @@ def parse_map_window(map_content: str) -> List[int]:
     return rest_sites
 
 
-def get_routes_to_rest_site(x_coord: int) -> List[Dict]:
+def _query_path_output(x_coord: int) -> Optional[str]:
     """
-    Execute path command for a rest site and parse the output.
-    Returns list of route dictionaries.
+    Execute path command for a rest site and read the Output window.
+    Returns the output text, or None if the command or read failed.
     """
     # Execute path command
     command = f"path 15 {x_coord}"
     results = execute_command_sequence([command], verify=True, timeout=5.0)
     
     if not results or not results[0]['success']:
-        return []
+        return None
     
     # Read the Output window
     output_content = read_window("Output")
     if output_content['error']:
+        return None
+    
+    return output_content['content']
+
+
+def get_routes_to_rest_site(x_coord: int) -> List[Route]:
+    """
+    Execute path command for a rest site and parse the output.
+    Returns list of scored routes.
+    """
+    output = _query_path_output(x_coord)
+    if output is None:
         return []
     
     # Parse the routes from output
-    return parse_path_output(output_content['content'], x_coord)
+    return parse_path_output(output, x_coord)
 
 
-def parse_path_output(output_content: str, destination_x: int) -> List[Dict]:
+def parse_path_output(output_content: str, destination_x: int) -> List[Route]:
     """
     Parse the path command output to extract routes.
-    Returns list of route dictionaries with encounter counts.
+    Returns list of scored routes with encounter counts.
     """
     routes = []
-    lines = output_content.strip().split('\n')
+    destination = f"15:{destination_x}"
+    # Strip every line once up front
+    lines = [line.strip() for line in output_content.splitlines()]
     
     # Look for pairs of lines (summary, detail)
     i = 0
     while i < len(lines) - 1:
-        line = lines[i].strip()
+        line = lines[i]
         
-        # Skip lines that don't look like route summaries
-        if not any(word in line for word in ['Elite', 'Monster', 'Rest', 'Shop', 'Unknown', 'Treasure', 'Emerald']):
+        # Skip lines that don't look like route summaries: a summary has
+        # comma-separated encounters (cheap check first) naming an encounter type
+        if ',' not in line or not _KEYWORD_RE.search(line):
             i += 1
             continue
         
-        # Check if this looks like a summary line (has comma-separated encounters)
-        if ',' in line and i + 1 < len(lines):
-            summary_line = line
-            detail_line = lines[i + 1].strip()
-            
-            # Verify detail line has the expected format (contains Floor)
-            if 'Floor' in detail_line or re.search(r'\w+ \d+ \d+', detail_line):
-                encounter_counts = parse_route_info(summary_line)
-                routes.append({
-                    'summary': summary_line,
-                    'detail': detail_line,
-                    'encounter_counts': encounter_counts,
-                    'destination': f"15:{destination_x}"
-                })
-                i += 2
-                continue
+        summary_line = line
+        detail_line = lines[i + 1]
+        
+        # Verify detail line has the expected format (contains Floor)
+        if 'Floor' in detail_line or _DETAIL_RE.search(detail_line):
+            encounter_counts = parse_route_info(summary_line)
+            routes.append(Route(
+                score=score_route(encounter_counts),
+                summary=summary_line,
+                detail=detail_line,
+                encounter_counts=encounter_counts,
+                destination=destination
+            ))
+            i += 2
+            continue
         
         i += 1
     
     return routes
 
 
-def parse_route_info(route_line: str) -> Dict[str, int]:
+def parse_route_info(route_line: str) -> Tuple[int, ...]:
     """
     Parse a route summary line to extract encounter counts.
     Example: "Elite 2, Rest 2, Unknown 1, Monster 9,"
+    Returns the counts indexed like ENCOUNTER_TYPES.
     """
-    encounter_counts = {
-        'Elite': 0,
-        'Emerald': 0,
-        'Rest': 0,
-        'Shop': 0,
-        'Unknown': 0,
-        'Monster': 0,
-        'Treasure': 0,
-    }
+    encounter_counts = [0] * len(ENCOUNTER_TYPES)
     
-    # Split by comma and parse each encounter
-    encounters = route_line.strip().rstrip(',').split(',')
-    for encounter in encounters:
-        encounter = encounter.strip()
-        
-        # Handle special case where Emerald might not have a count
-        if encounter == 'Emerald':
-            encounter = 'Emerald 1'
-        
-        # Parse encounter type and count
-        match = re.match(r'(\w+)\s+(\d+)', encounter)
-        if match:
-            encounter_type, count = match.groups()
-            if encounter_type in encounter_counts:
-                encounter_counts[encounter_type] = int(count)
+    # Tokenize the whole line in one regex pass
+    for match in _ENCOUNTER_RE.finditer(route_line):
+        encounter_type, count = match.groups()
+        encounter_counts[_IDX[encounter_type]] = int(count or 1)
     
-    return encounter_counts
+    return tuple(encounter_counts)
 
 
-def score_route(encounter_counts: Dict[str, int]) -> int:
+def score_route(c: Tuple[int, ...]) -> int:
     """
     Calculate the score for a route based on encounter counts.
     Formula: Elite×3 + Emerald×3 + Rest×2 + Shop×1 + Monster×1 - Unknown×1
     """
-    return (encounter_counts['Elite'] * 3 +
-            encounter_counts['Emerald'] * 3 +
-            encounter_counts['Rest'] * 2 +
-            encounter_counts['Shop'] * 1 +
-            encounter_counts['Monster'] * 1 -
-            encounter_counts['Unknown'] * 1)
\ No newline at end of file
+    # Indexes follow ENCOUNTER_TYPES
+    return 3 * c[0] + 3 * c[1] + 2 * c[2] + c[3] + c[5] - c[4]
\ No newline at end of file
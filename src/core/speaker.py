@@ -22,15 +22,20 @@ class Speaker:
         self.model = "eleven_turbo_v2_5"
         
         # Audio settings
-        self.chunk_size = 4096  # Optimized chunk size
         self.sample_rate = 16000  # Using 16kHz PCM format
         self.channels = 1
         self.sample_width = 2  # 16-bit audio (S16LE)
         self.frames_per_buffer = 2048  # Separate buffer size for PyAudio
+        # Download one PyAudio buffer at a time so chunks hold whole 16-bit frames
+        self.chunk_size = self.frames_per_buffer * self.sample_width
         
-        # PyAudio instance
+        # PyAudio instance and output stream, shared by all utterances
         self.pyaudio = None
         self.stream = None
+        self.stream_lock = threading.Lock()
+        
+        # HTTP session, keeps the TLS connection to the API open between utterances
+        self.session = requests.Session()
         
         # Thread for async playback
         self.playback_thread = None
@@ -38,6 +43,8 @@ class Speaker:
         # Check if API key is available
         if not self.api_key:
             print("Warning: ELEVENLABS_API_KEY not found in .env file. Speech disabled.")
+        else:
+            self.pyaudio = pyaudio.PyAudio()
     
     def speak(self, text: str, async_mode: bool = True) -> bool:
         """
@@ -68,12 +75,9 @@ class Speaker:
             # Blocking playback
             return self._stream_and_play(text)
     
-    def _stream_and_play(self, text: str) -> bool:
-        """Stream audio from ElevenLabs API and play it."""
-        try:
-            # Initialize PyAudio
-            self.pyaudio = pyaudio.PyAudio()
-            
+    def _get_stream(self):
+        """Get the output stream, opening it on first use and restarting it otherwise."""
+        if self.stream is None:
             # Open audio stream with optimized parameters
             self.stream = self.pyaudio.open(
                 format=pyaudio.paInt16,
@@ -84,11 +88,25 @@ class Speaker:
                 output_device_index=None,  # Use default device
                 stream_callback=None  # Blocking mode
             )
+        elif self.stream.is_stopped():
+            self.stream.start_stream()
+        return self.stream
+    
+    def _stream_and_play(self, text: str) -> bool:
+        """Stream audio from ElevenLabs API and play it."""
+        # One utterance at a time on the shared stream
+        with self.stream_lock:
+            return self._play_locked(text)
+    
+    def _play_locked(self, text: str) -> bool:
+        """Stream and play one utterance; the caller holds stream_lock."""
+        try:
+            stream = self._get_stream()
             
             # Prepare API request
             url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
+            # No audio/mpeg Accept header: output_format below selects raw PCM
             headers = {
-                "Accept": "audio/mpeg",
                 "xi-api-key": self.api_key,
                 "Content-Type": "application/json"
             }
@@ -104,34 +122,32 @@ class Speaker:
             }
             
             # Make streaming request with PCM output format
-            params = {"output_format": "pcm_16000"}  # Request 16kHz PCM format
-            response = requests.post(url, headers=headers, json=data, params=params, stream=True)
+            params = {"output_format": f"pcm_{self.sample_rate}"}  # Request 16kHz PCM format
+            response = self.session.post(url, headers=headers, json=data, params=params, stream=True)
             
             if response.ok:
-                # Collect all audio data first
-                audio_data = b''
+                # Play audio while it downloads, in whole frames_per_buffer sized chunks
+                playback_chunk_size = self.chunk_size
+                pending = bytearray()
                 bytes_received = 0
                 
-                print("Downloading audio...")
                 for chunk in response.iter_content(chunk_size=self.chunk_size):
                     if chunk:
-                        audio_data += chunk
+                        pending.extend(chunk)
                         bytes_received += len(chunk)
+                        
+                        # Write every complete buffer as soon as it has arrived
+                        complete = len(pending) - len(pending) % playback_chunk_size
+                        if complete:
+                            stream.write(bytes(pending[:complete]))
+                            del pending[:complete]
                 
-                print(f"Downloaded {bytes_received} bytes, starting playback...")
-                
-                # Play audio data in properly sized chunks for PyAudio
-                # Use frames_per_buffer size for playback
-                playback_chunk_size = self.frames_per_buffer * self.sample_width
-                
-                for i in range(0, len(audio_data), playback_chunk_size):
-                    chunk = audio_data[i:i + playback_chunk_size]
-                    # Pad the last chunk if needed
-                    if len(chunk) < playback_chunk_size:
-                        chunk += b'\x00' * (playback_chunk_size - len(chunk))
-                    self.stream.write(chunk)
+                # Pad the last chunk if needed
+                if pending:
+                    pending.extend(b'\x00' * (playback_chunk_size - len(pending)))
+                    stream.write(bytes(pending))
                 
-                print(f"Speech playback complete")
+                print(f"Speech playback complete ({bytes_received} bytes)")
                 return True
             else:
                 print(f"Speech error: {response.status_code} - {response.text}")
@@ -141,14 +157,22 @@ class Speaker:
             print(f"Speech playback error: {e}")
             return False
         finally:
-            # Clean up
-            if self.stream:
+            # Keep the stream open for the next utterance, just stop it
+            if self.stream and not self.stream.is_stopped():
                 self.stream.stop_stream()
-                self.stream.close()
-            if self.pyaudio:
-                self.pyaudio.terminate()
     
     def wait_for_completion(self):
         """Wait for async playback to complete."""
         if self.playback_thread and self.playback_thread.is_alive():
-            self.playback_thread.join()
\ No newline at end of file
+            self.playback_thread.join()
+    
+    def close(self):
+        """Close the output stream, release PyAudio and close the HTTP session."""
+        with self.stream_lock:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            if self.pyaudio:
+                self.pyaudio.terminate()
+                self.pyaudio = None
+        self.session.close()
\ No newline at end of file
@@ -1,14 +1,25 @@
 """Text extractor for Text the Spire integration using pywinauto."""
 
+import threading
 import time
 import win32gui
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pywinauto import Application
 
 from sts_types import WindowContent, MultiWindowContent
 from utils.constants import GAME_STATE_WINDOWS
 
 
+WM_GETTEXTLENGTH = 0x000E
+
+# Connected pywinauto (Application, window) per handle, so each window is only connected once
+_WINDOW_CACHE: Dict[int, Tuple[Application, Any]] = {}
+_WINDOW_CACHE_LOCK = threading.Lock()
+
+# Child control handles per window handle; the controls of a game window do not change
+_CHILD_CACHE: Dict[int, List[int]] = {}
+
+
 def _get_window_handle(window_title: str) -> Optional[int]:
     """Find window handle by title for Text the Spire windows."""
     def enum_callback(hwnd, windows):
@@ -25,32 +36,91 @@ def _get_window_handle(window_title: str) -> Optional[int]:
     return windows[0] if windows else None
 
 
+def _get_window(handle: int) -> Any:
+    """Get the pywinauto window for a handle, connecting only on first use.
+    
+    A cached connection is only reused while the handle is still a window.
+    """
+    with _WINDOW_CACHE_LOCK:
+        cached = _WINDOW_CACHE.get(handle)
+        if cached is None or not win32gui.IsWindow(handle):
+            # win32 is pywinauto's default backend; naming it just pins that choice
+            app = Application(backend="win32").connect(handle=handle)
+            cached = (app, app.window(handle=handle))
+            _WINDOW_CACHE[handle] = cached
+    return cached[1]
+
+
+def _use_window(handle: int, action: Callable[[Any], Any]) -> Any:
+    """Run action on the cached window for a handle.
+    
+    If connecting to the window fails, the cached connection is dropped and
+    the connection retried once. The action itself runs only once, since it
+    may already have typed keys when it fails.
+    """
+    try:
+        window = _get_window(handle)
+    except Exception:
+        with _WINDOW_CACHE_LOCK:
+            _WINDOW_CACHE.pop(handle, None)
+        window = _get_window(handle)
+    return action(window)
+
+
+def _read_children_text(window: Any) -> Optional[str]:
+    """Join the text of a window's children, or None if the window is not readable."""
+    # Verify window is accessible
+    if not window.exists() or not window.is_visible():
+        return None
+    
+    # Use Method 2 (children aggregation) - proven most effective
+    children = window.children()
+    all_text = []
+    for child in children:
+        child_text = child.window_text()
+        if child_text.strip():
+            all_text.append(child_text)
+    
+    combined = '\n'.join(all_text)
+    return combined.strip() if combined.strip() else None
+
+
 def _extract_window_text(handle: int, title: str) -> Optional[str]:
     """Extract text content from a window using the proven children aggregation method."""
     try:
-        app = Application().connect(handle=handle)
-        window = app.window(handle=handle)
-        
-        # Verify window is accessible
-        if not window.exists() or not window.is_visible():
-            return None
-        
-        # Use Method 2 (children aggregation) - proven most effective
-        children = window.children()
-        all_text = []
-        for child in children:
-            child_text = child.window_text()
-            if child_text.strip():
-                all_text.append(child_text)
-        
-        combined = '\n'.join(all_text)
-        return combined.strip() if combined.strip() else None
-        
+        return _use_window(handle, _read_children_text)
     except Exception:
         # Return None for any connection/extraction errors
         return None
 
 
+def _child_handles(handle: int) -> List[int]:
+    """Get a window's child control handles, enumerating them only once per handle."""
+    children = _CHILD_CACHE.get(handle)
+    if children is None:
+        children = []
+        try:
+            win32gui.EnumChildWindows(handle, lambda child, found: found.append(child) or True, children)
+        except Exception:
+            # pywin32 raises for windows without children
+            pass
+        _CHILD_CACHE[handle] = children
+    return children
+
+
+def get_text_length(handle: int) -> Optional[int]:
+    """Get the total text length of a window's child controls without copying any text.
+    
+    Uses WM_GETTEXTLENGTH, so it is cheap enough to poll for changes before
+    reading the full text. Returns None if the window cannot be queried.
+    """
+    try:
+        return sum(win32gui.SendMessage(child, WM_GETTEXTLENGTH, 0, 0) for child in _child_handles(handle))
+    except Exception:
+        _CHILD_CACHE.pop(handle, None)
+        return None
+
+
 def read_window(window_title: str) -> WindowContent:
     """Read content from a specific Text the Spire window.
     
@@ -123,9 +193,7 @@ def check_window_availability(window_title: str) -> bool:
         return False
     
     try:
-        app = Application().connect(handle=handle)
-        window = app.window(handle=handle)
-        return window.exists() and window.is_visible()
+        return _use_window(handle, lambda window: window.exists() and window.is_visible())
     except Exception:
         return False
 
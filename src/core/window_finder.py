@@ -1,9 +1,22 @@
 """Window finder for Text the Spire integration."""
 
+import sys
 import win32gui
 from typing import List, Dict, Tuple
 from sts_types import WindowInfo
-from utils.constants import GAME_STATE_WINDOWS
+from utils.constants import (
+    GAME_STATE_WINDOWS, PROMPT_WINDOW_TITLES,
+    GAME_STATE_WINDOW_CLASS, PROMPT_WINDOW_CLASS
+)
+
+
+# Set versions of the title lists for lookups while filtering windows
+_GAME_STATE_TITLES = frozenset(GAME_STATE_WINDOWS)
+_PROMPT_TITLES = frozenset(PROMPT_WINDOW_TITLES)
+
+# Interned window classes of the Text the Spire windows
+_GAME_STATE_CLASS = sys.intern(GAME_STATE_WINDOW_CLASS)
+_PROMPT_CLASS = sys.intern(PROMPT_WINDOW_CLASS)
 
 
 def _enum_windows_callback(hwnd: int, windows: List[Tuple[int, str, str]]) -> bool:
@@ -31,14 +44,14 @@ def list_windows() -> List[WindowInfo]:
     
     for hwnd, title, class_name in all_windows:
         # Game state windows (SWT_Window0 class)
-        if title in GAME_STATE_WINDOWS and class_name == 'SWT_Window0':
+        if title in _GAME_STATE_TITLES and class_name == _GAME_STATE_CLASS:
             text_spire_windows.append({
                 'title': title,
                 'type': 'game_state',
                 'class_name': class_name
             })
         # Prompt window (SunAwtFrame class)
-        elif title in ['Prompt', 'info'] and class_name == 'SunAwtFrame':
+        elif title in _PROMPT_TITLES and class_name == _PROMPT_CLASS:
             text_spire_windows.append({
                 'title': title,
                 'type': 'command',
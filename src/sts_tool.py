@@ -124,16 +124,16 @@ def handle_speak(args, speaker):
 
 def handle_routes(args):
     """Handle --routes command."""
-    from core.route_evaluator import evaluate_all_routes
+    from core.route_evaluator import evaluate_all_routes, ENCOUNTER_TYPES
     
     print(f"\nEvaluating routes to floor 15 rest sites...")
     print("-" * 60)
     
-    routes = evaluate_all_routes(top_n=args.routes)
+    routes, error = evaluate_all_routes(top_n=args.routes)
     
     # Check for errors
-    if routes and 'error' in routes[0]:
-        print(f"Error: {routes[0]['error']}")
+    if error:
+        print(f"Error: {error}")
         return 1
     
     if not routes:
@@ -143,13 +143,13 @@ def handle_routes(args):
     # Display routes
     print(f"Evaluated {len(routes)} unique routes\n")
     for i, route in enumerate(routes, 1):
-        print(f"Route {i} (Score: {route['score']}):")
-        counts = route['encounter_counts']
+        print(f"Route {i} (Score: {route.score}):")
+        counts = dict(zip(ENCOUNTER_TYPES, route.encounter_counts))
         print(f"  Emerald {counts['Emerald']}, Elite {counts['Elite']}, Rest {counts['Rest']}, "
               f"Shop {counts['Shop']}, Unknown {counts['Unknown']}, Monster {counts['Monster']}, "
               f"Treasure {counts['Treasure']}")
-        print(f"  Path: {route['detail']}")
-        print(f"  Destination: Rest Floor:{route['destination']}")
+        print(f"  Path: {route.detail}")
+        print(f"  Destination: Rest Floor:{route.destination}")
         print()
     
     return 0
@@ -231,6 +231,9 @@ Examples:
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if speaker:
+            speaker.close()
     
     return 0
 
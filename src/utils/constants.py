@@ -21,7 +21,8 @@ MAX_RELIABLE_COMMANDS_PER_SECOND = 4
 # Command wait times (in seconds)
 QUICK_COMMAND_WAIT = 1.0  # For info commands like help, tutorial, info, version
 SLOW_COMMAND_WAIT = 5.0   # For game state commands like end, choose, play
+LOG_QUIET_PERIOD = 0.5    # Log unchanged this long after a quick command means its response is complete
 
 
 # Slow commands (change game state, may have animations)
-SLOW_COMMANDS = {"end", "choose", "play", "quit", "continue"}
\ No newline at end of file
+SLOW_COMMANDS = frozenset({"end", "choose", "play", "quit", "continue"})
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""UI helpers shared by the command executor and the command scripts."""
+
+import time
+from typing import Callable
+
+# Characters with a meaning in pywinauto key strings (modifiers, grouping, named keys)
+PYWINAUTO_SPECIAL_KEYS = frozenset('+^%~(){}[]')
+
+def wait_until(predicate: Callable[[], bool], max_wait: float, poll: float = 0.001) -> bool:
+    """Poll predicate until it holds or max_wait seconds pass.
+    
+    The poll interval starts at poll and doubles on each miss, so a quick UI
+    update is seen within a millisecond or two without spinning on a slow one.
+    Returns False on timeout.
+    """
+    deadline = time.perf_counter() + max_wait
+    while True:
+        try:
+            if predicate():
+                return True
+        except Exception:
+            # State not readable, fall back to waiting out the full delay
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            return False
+        
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        time.sleep(min(poll, remaining))
+        poll *= 2
+
+def escape_pywinauto_keys(text: str) -> str:
+    """Escape pywinauto type_keys special characters so text is typed literally."""
+    return ''.join('{' + char + '}' if char in PYWINAUTO_SPECIAL_KEYS else char for char in text)
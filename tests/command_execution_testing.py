@@ -46,10 +46,10 @@ class CommandTester:
             return False
         
         try:
-            app = Application().connect(handle=prompt_data['hwnd'])
-            self.prompt_window = app.window(handle=prompt_data['hwnd'])
+            app = Application().connect(handle=prompt_data.hwnd)
+            self.prompt_window = app.window(handle=prompt_data.hwnd)
             self.connected = True
-            print(f"[OK] Connected to prompt window (handle: {prompt_data['hwnd']})")
+            print(f"[OK] Connected to prompt window (handle: {prompt_data.hwnd})")
             return True
         except Exception as e:
             print(f"[ERROR] Could not connect to prompt window: {e}")
@@ -89,8 +89,8 @@ class CommandTester:
         game_state_windows = self.finder.get_game_state_windows()
         
         for window_data in game_state_windows:
-            title = window_data['title']
-            handle = window_data['hwnd']
+            title = window_data.title
+            handle = window_data.hwnd
             
             try:
                 app = Application().connect(handle=handle)
@@ -40,8 +40,8 @@ def get_prompt_window():
         return None, None
     
     try:
-        app = Application().connect(handle=prompt_data['hwnd'])
-        window = app.window(handle=prompt_data['hwnd'])
+        app = Application().connect(handle=prompt_data.hwnd)
+        window = app.window(handle=prompt_data.hwnd)
         return window, prompt_data
     except Exception as e:
         print(f"[ERROR] Could not connect to prompt window: {e}")
@@ -55,8 +55,8 @@ def capture_game_state_before_command():
     state_before = {}
     
     for window_data in game_state_windows:
-        title = window_data['title']
-        handle = window_data['hwnd']
+        title = window_data.title
+        handle = window_data.hwnd
         
         try:
             app = Application().connect(handle=handle)
@@ -87,7 +87,7 @@ def test_basic_text_input():
     if not window:
         return False
     
-    print(f"Connected to prompt window (handle: {prompt_data['hwnd']})")
+    print(f"Connected to prompt window (handle: {prompt_data.hwnd})")
     
     # Test different text input methods
     test_commands = [
@@ -40,7 +40,7 @@ def get_prompt_window_handle():
         print("[ERROR] Prompt window not found")
         return None, None
     
-    return prompt_data['hwnd'], prompt_data
+    return prompt_data.hwnd, prompt_data
 
 def test_window_focus_winapi():
     """Test focusing the prompt window using Windows API."""
@@ -251,8 +251,8 @@ def capture_state_changes():
     # Get initial state
     try:
         from pywinauto import Application
-        log_app = Application().connect(handle=log_window['hwnd'])
-        log_win = log_app.window(handle=log_window['hwnd'])
+        log_app = Application().connect(handle=log_window.hwnd)
+        log_win = log_app.window(handle=log_window.hwnd)
         
         # Get initial text
         children = log_win.children()
@@ -49,11 +49,11 @@ def test_prompt_window_finding():
         return False
     
     print(f"[OK] Prompt window found:")
-    print(f"  Handle: {prompt_window['hwnd']}")
-    print(f"  Title: '{prompt_window['title']}'")
-    print(f"  Class: '{prompt_window['class_name']}'")
-    print(f"  Size: {prompt_window['width']}x{prompt_window['height']}")
-    print(f"  Process ID: {prompt_window['process_id']}")
+    print(f"  Handle: {prompt_window.hwnd}")
+    print(f"  Title: '{prompt_window.title}'")
+    print(f"  Class: '{prompt_window.class_name}'")
+    print(f"  Size: {prompt_window.width}x{prompt_window.height}")
+    print(f"  Process ID: {prompt_window.process_id}")
     
     return prompt_window
 
@@ -68,7 +68,7 @@ def test_prompt_window_connection():
         print("[ERROR] Cannot test connection - prompt window not found")
         return None
     
-    handle = prompt_window['hwnd']
+    handle = prompt_window.hwnd
     
     try:
         # Connect using pywinauto (proven method from Section 3)
@@ -106,7 +106,7 @@ def test_prompt_window_focus():
         print("[ERROR] Cannot test focus - prompt window not found")
         return False
     
-    handle = prompt_window['hwnd']
+    handle = prompt_window.hwnd
     
     try:
         # Connect to window
@@ -160,7 +160,7 @@ def test_prompt_window_children():
         print("[ERROR] Cannot test children - prompt window not found")
         return None
     
-    handle = prompt_window['hwnd']
+    handle = prompt_window.hwnd
     
     try:
         # Connect to window
@@ -55,8 +55,8 @@ def test_text_extraction_reliability():
     results = {}
     
     for window_dict in game_state_windows:
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         
         if title not in key_windows:
             continue
@@ -106,8 +106,8 @@ def test_text_formatting_parsing():
     parsing_tests = {}
     
     for window_dict in game_state_windows:
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         
         text = extract_window_text(handle, title)
         if not text:
@@ -208,8 +208,8 @@ def test_text_update_detection():
     
     print("Taking initial snapshots...")
     for window_dict in game_state_windows:
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         
         if title not in monitor_windows:
             continue
@@ -231,7 +231,7 @@ def test_text_update_detection():
             if not window_dict:
                 continue
                 
-            current_text = extract_window_text(window_dict['hwnd'], title)
+            current_text = extract_window_text(window_dict.hwnd, title)
             
             if current_text != initial_text:
                 if title not in changes_detected:
@@ -271,8 +271,8 @@ def test_text_extraction_performance():
     successful_extractions = 0
     
     for window_dict in game_state_windows:
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         
         extraction_start = time.time()
         text = extract_window_text(handle, title)
@@ -299,7 +299,7 @@ def test_text_extraction_performance():
     if player_window:
         rapid_start = time.time()
         for i in range(10):
-            text = extract_window_text(player_window['hwnd'], 'Player')
+            text = extract_window_text(player_window.hwnd, 'Player')
         rapid_time = time.time() - rapid_start
         
         print(f"  10 rapid extractions: {rapid_time:.4f}s ({rapid_time/10:.4f}s each)")
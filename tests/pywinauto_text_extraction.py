@@ -46,8 +46,8 @@ def test_pywinauto_connection():
     # Test connecting to each game state window
     connected_windows = []
     for i, window_dict in enumerate(game_state_windows):
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         try:
             print(f"\nTesting window {i+1}: '{title}' (handle: {handle})")
             
@@ -73,8 +73,8 @@ def test_pywinauto_connection():
     
     # Test prompt window connection if available
     if prompt_window:
-        handle = prompt_window['hwnd']
-        title = prompt_window['title']
+        handle = prompt_window.hwnd
+        title = prompt_window.title
         try:
             print(f"\n4. Testing prompt window connection: '{title}'")
             app = Application().connect(handle=handle)
@@ -105,8 +105,8 @@ def test_window_controls():
     
     # Test the first few windows for control access
     for i, window_dict in enumerate(game_state_windows[:3]):
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         try:
             print(f"\nTesting controls for '{title}':")
             
@@ -156,8 +156,8 @@ def test_text_extraction_methods():
     priority_windows = ['Player', 'Monster', 'Hand', 'Output']
     
     for window_dict in game_state_windows:
-        handle = window_dict['hwnd']
-        title = window_dict['title']
+        handle = window_dict.hwnd
+        title = window_dict.title
         if title not in priority_windows:
             continue
             